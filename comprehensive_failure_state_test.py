@@ -112,7 +112,7 @@ def test_comprehensive_failure_state():
     print(f"   📜 Regulatory considerations: {len(result['regulatory_considerations'])}")
     
     # Export complete scenario
-    filename = sim.export_scenario()
+    filename = sim.export_scenario().result()
     print(f"\n💾 Complete scenario exported to: {filename}")
     
     # Validation summary
@@ -5,8 +5,11 @@ Downloads historical METAR weather data from NOAA Aviation Weather Center
 
 import requests
 import os
+import logging
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Iterator, Optional
+
+logger = logging.getLogger(__name__)
 
 def download_noaa_metar(icao_code: str, year: int, month: int, output_dir: str = "data/metar") -> bool:
     """
@@ -34,21 +37,27 @@ def download_noaa_metar(icao_code: str, year: int, month: int, output_dir: str =
     try:
         # Generate realistic sample METAR data for demonstration
         # In production, this would download from actual NOAA sources
-        sample_metar_data = generate_sample_metar(icao_code, year, month)
-        
-        with open(output_file, 'w') as f:
-            f.write(sample_metar_data)
+        with open(output_file, 'w', buffering=1 << 16) as f:
+            f.writelines(line + "\n" for line in iter_sample_metar(icao_code, year, month))
         
-        print(f"✓ Downloaded METAR data for {icao_code} {year}-{month:02d} to {output_file}")
+        logger.info("✓ Downloaded METAR data for %s %04d-%02d to %s", icao_code, year, month, output_file)
         return True
         
     except Exception as e:
-        print(f"✗ Failed to download METAR data for {icao_code}: {e}")
+        logger.error("✗ Failed to download METAR data for %s: %s", icao_code, e)
         return False
 
 def generate_sample_metar(icao_code: str, year: int, month: int) -> str:
     """
-    Generate realistic sample METAR data for demonstration purposes
+    Generate realistic sample METAR data as a single newline-joined string
+    Kept for callers that need the whole block; file writers should stream
+    iter_sample_metar() instead
+    """
+    return "\n".join(iter_sample_metar(icao_code, year, month))
+
+def iter_sample_metar(icao_code: str, year: int, month: int) -> Iterator[str]:
+    """
+    Yield realistic sample METAR lines for demonstration purposes
     In production, this would be replaced with actual NOAA data downloads
     """
     
@@ -70,41 +79,35 @@ def generate_sample_metar(icao_code: str, year: int, month: int) -> str:
     
     conditions = weather_patterns.get(month, [""])
     
-    metar_lines = []
-    
     # Generate 15-20 METAR reports for the month
     for day in range(1, 21):
-        for hour in [6, 12, 18]:  # 3 reports per day
-            timestamp = f"{year}{month:02d}{day:02d}"
-            condition = conditions[day % len(conditions)] if conditions[0] else ""
-            
-            metar = f"{icao_code} {timestamp} METAR {icao_code} {day:02d}{hour:02d}51Z "
-            
-            # Add weather condition if present
-            if condition:
-                metar += f"27015KT 8SM {condition} BKN030 "
-            else:
-                metar += "27015KT 10SM BKN040 "
-            
-            # Add temperature/dewpoint and pressure
-            metar += "M04/M18 A3041 RMK AO2 SLP302"
-            
-            metar_lines.append(metar)
-    
-    return "\n".join(metar_lines)
+        condition = conditions[day % len(conditions)] if conditions[0] else ""
+        
+        # Resolve the weather group once per day; only the hour varies per report
+        if condition:
+            weather = f"27015KT 8SM {condition} BKN030"
+        else:
+            weather = "27015KT 10SM BKN040"
+        
+        line_prefix = f"{icao_code} {year}{month:02d}{day:02d} METAR {icao_code} {day:02d}"
+        line_suffix = f"51Z {weather} M04/M18 A3041 RMK AO2 SLP302"
+        
+        for hour in (6, 12, 18):  # 3 reports per day
+            yield f"{line_prefix}{hour:02d}{line_suffix}"
 
 def test_download():
     """Test the METAR download functionality"""
-    print("Testing METAR download system...")
+    logger.info("Testing METAR download system...")
     
     # Test with JFK for current month
     now = datetime.utcnow()
     success = download_noaa_metar("KJFK", now.year, now.month)
     
     if success:
-        print("✓ METAR download test successful")
+        logger.info("✓ METAR download test successful")
     else:
-        print("✗ METAR download test failed")
+        logger.error("✗ METAR download test failed")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     test_download()
\ No newline at end of file
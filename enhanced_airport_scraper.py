@@ -7,6 +7,7 @@ import asyncio
 import pandas as pd
 from datetime import datetime, timedelta
 import os
+import logging
 import json
 import re
 from typing import Dict, List, Optional
@@ -380,4 +381,5 @@ def main():
     return flight_data, validation_results
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     flight_data, validation_results = main()
\ No newline at end of file
@@ -3,11 +3,55 @@ Enhanced Alternate Airport Ranking System with Airport Intelligence Integration
 Combines airport intelligence data with AINO platform's diversion planning capabilities
 """
 
+import copy
+import heapq
 import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
 from datetime import datetime
 from typing import Dict, List, Optional
 from airport_intel import get_airport_info, score_airport, AIRPORT_DB
 
+# Repeat evaluations of the same scenario within this window reuse the cached result
+SCENARIO_CACHE_TTL_S = 60
+# Upper bound on cached scenarios; the oldest are evicted first
+SCENARIO_CACHE_MAX_ENTRIES = 256
+
+@dataclass(slots=True, frozen=True)
+class Recommendation:
+    """Ranked alternate airport recommendation"""
+    rank: int
+    icao: str
+    airport_name: str
+    intelligence_score: int
+    suitability: str
+    rationale: str
+    operational_notes: List[str]
+    virgin_atlantic_support: Dict
+
+@dataclass(slots=True, frozen=True)
+class DecisionMatrix:
+    """Primary/backup/emergency alternate selection for operational use"""
+    primary_choice: Optional[str]
+    backup_choice: Optional[str]
+    emergency_choice: Optional[str]
+    decision_factors: List[str]
+
+@dataclass(slots=True, frozen=True)
+class ScenarioResult:
+    """Complete diversion scenario evaluation"""
+    scenario_assessment: Dict
+    airport_intelligence: Dict
+    operational_assessment: Dict
+    recommendations: List[Recommendation]
+    decision_matrix: DecisionMatrix
+    
+    def to_dict(self) -> Dict:
+        """JSON-serializable dict matching the original response schema"""
+        return asdict(self)
+
 class EnhancedAlternateRanker:
     """Enhanced alternate airport ranking with intelligence integration"""
     
@@ -20,12 +64,38 @@ class EnhancedAlternateRanker:
             "LPAZ",  # Azores - Portuguese
             "BGTL"   # Thule - Greenland (emergency only)
         ]
+        self._scenario_cache: Dict[tuple, tuple] = {}
+        self._ts_cache = (0, "")
+        
+        # Airport-specific rationale and notes depend only on static AIRPORT_DB data
+        self._base_rationale = {}
+        self._base_notes = {}
+        for icao in self.transatlantic_alternates:
+            airport_info = get_airport_info(icao)
+            self._base_rationale[icao] = self._airport_rationale_parts(airport_info)
+            self._base_notes[icao] = self._airport_operational_notes(airport_info)
         
     def evaluate_diversion_scenario(self, failure_type: str, aircraft_type: str, 
-                                  current_position: Dict, flight_phase: str) -> Dict:
+                                  current_position: Dict, flight_phase: str) -> ScenarioResult:
         """
         Evaluate complete diversion scenario with airport intelligence
+
+        Results are cached per 1-degree position cell for SCENARIO_CACHE_TTL_S
+        seconds, with assessed_at refreshed on each hit; CRITICAL failures are
+        always evaluated fresh.
         """
+        cache_key = (failure_type, aircraft_type, flight_phase,
+                     round(current_position.get("lat", 0.0)),
+                     round(current_position.get("lon", 0.0)))
+        cached = self._scenario_cache.get(cache_key)
+        if cached:
+            if time.monotonic() - cached[0] < SCENARIO_CACHE_TTL_S:
+                scenario = copy.deepcopy(cached[1])
+                # The copy is assessed now, not when the cached result was built
+                scenario.scenario_assessment["assessed_at"] = self._iso_now()
+                return scenario
+            del self._scenario_cache[cache_key]
+        
         # Get airport intelligence scores for all alternates
         airport_scores = {}
         for icao in self.transatlantic_alternates:
@@ -48,18 +118,62 @@ class EnhancedAlternateRanker:
             airport_scores, operational_assessment, failure_type
         )
         
-        return {
-            "scenario_assessment": {
+        scenario = ScenarioResult(
+            scenario_assessment={
                 "failure_type": failure_type,
                 "aircraft_type": aircraft_type,
                 "flight_phase": flight_phase,
-                "assessed_at": datetime.now().isoformat()
+                "assessed_at": self._iso_now()
             },
-            "airport_intelligence": airport_scores,
-            "operational_assessment": operational_assessment,
-            "recommendations": recommendations,
-            "decision_matrix": self._create_decision_matrix(airport_scores, failure_type)
-        }
+            airport_intelligence=airport_scores,
+            operational_assessment=operational_assessment,
+            recommendations=recommendations,
+            decision_matrix=self._create_decision_matrix(airport_scores, failure_type)
+        )
+        
+        if operational_assessment["failure_severity"]["severity"] != "CRITICAL":
+            self._cache_scenario(cache_key, scenario)
+        
+        return scenario
+    
+    def _cache_scenario(self, cache_key: tuple, scenario: ScenarioResult) -> None:
+        """Cache a scenario, evicting expired entries and the oldest beyond SCENARIO_CACHE_MAX_ENTRIES"""
+        now = time.monotonic()
+        cache = self._scenario_cache
+        cache.pop(cache_key, None)
+        # Entries are stored in insertion (= timestamp) order, so stale ones are at the front
+        while cache:
+            oldest_key, (stamp, _) = next(iter(cache.items()))
+            if now - stamp < SCENARIO_CACHE_TTL_S and len(cache) < SCENARIO_CACHE_MAX_ENTRIES:
+                break
+            del cache[oldest_key]
+        cache[cache_key] = (now, copy.deepcopy(scenario))
+    
+    def batch_evaluate(self, scenarios: List[Dict],
+                       max_workers: Optional[int] = None) -> List[ScenarioResult]:
+        """
+        Evaluate many diversion scenarios across worker processes
+        
+        Each scenario dict carries the evaluate_diversion_scenario keyword
+        arguments. Results are returned in input order.
+        """
+        if not scenarios:
+            return []
+        
+        workers = max_workers or os.cpu_count() or 1
+        chunksize = max(1, len(scenarios) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            return list(executor.map(_worker_eval, scenarios, chunksize=chunksize))
+    
+    def _iso_now(self) -> str:
+        """Local ISO timestamp, reformatting the date/time prefix once per second"""
+        now = time.time()
+        sec = int(now)
+        cached_sec, prefix = self._ts_cache
+        if sec != cached_sec:
+            prefix = datetime.fromtimestamp(sec).strftime("%Y-%m-%dT%H:%M:%S")
+            self._ts_cache = (sec, prefix)
+        return f"{prefix}.{int((now - sec) * 1e6):06d}"
     
     def _get_suitability_category(self, score: int) -> str:
         """Convert intelligence score to suitability category"""
@@ -110,76 +224,101 @@ class EnhancedAlternateRanker:
         }
     
     def _generate_enhanced_recommendations(self, airport_scores: Dict, 
-                                         operational: Dict, failure_type: str) -> List[Dict]:
+                                         operational: Dict, failure_type: str) -> List[Recommendation]:
         """Generate prioritized recommendations with rationale"""
         
         recommendations = []
         
-        # Sort airports by intelligence score
-        sorted_airports = sorted(airport_scores.items(), 
-                               key=lambda x: x[1]["intelligence_score"], 
-                               reverse=True)
+        # Top 3 airports by intelligence score, skipping those with critical issues.
+        # UNSUITABLE scores sit below every other category, so filtering first
+        # leaves the ranks of the remaining airports unchanged.
+        top_airports = heapq.nlargest(
+            3,
+            ((icao, data) for icao, data in airport_scores.items()
+             if data["suitability"] != "UNSUITABLE"),
+            key=lambda x: x[1]["intelligence_score"]
+        )
         
-        for rank, (icao, data) in enumerate(sorted_airports, 1):
+        # Positional construction in Recommendation field order skips the
+        # per-call keyword-argument dict
+        for rank, (icao, data) in enumerate(top_airports, 1):
             airport_info = data["airport_info"]
-            
-            # Skip if airport has critical issues
-            if data["suitability"] == "UNSUITABLE":
-                continue
-                
-            recommendation = {
-                "rank": rank,
-                "icao": icao,
-                "airport_name": airport_info.get("name", "Unknown"),
-                "intelligence_score": data["intelligence_score"],
-                "suitability": data["suitability"],
-                "rationale": self._generate_rationale(airport_info, failure_type),
-                "operational_notes": self._generate_operational_notes(airport_info),
-                "virgin_atlantic_support": self._assess_va_support(icao)
-            }
-            
-            recommendations.append(recommendation)
-        
-        return recommendations[:3]  # Top 3 recommendations
+            recommendations.append(Recommendation(
+                rank,
+                icao,
+                airport_info.get("name", "Unknown"),
+                data["intelligence_score"],
+                data["suitability"],
+                self._generate_rationale(airport_info, failure_type),
+                self._generate_operational_notes(airport_info),
+                self._assess_va_support(icao)
+            ))
+        
+        return recommendations
     
     def _generate_rationale(self, airport_info: Dict, failure_type: str) -> str:
         """Generate rationale for airport selection"""
+        icao = airport_info.get("icao")
+        if icao in self._base_rationale:
+            rationale_parts = list(self._base_rationale[icao])
+        else:
+            rationale_parts = self._airport_rationale_parts(airport_info)
+        
+        # Failure-specific rationale
+        if failure_type == "engine_failure":
+            rationale_parts.append("Single-engine approach capability")
+        elif failure_type == "decompression":
+            rationale_parts.append("Suitable for emergency descent")
+        
+        return "; ".join(rationale_parts) if rationale_parts else "Standard alternate"
+    
+    def _airport_rationale_parts(self, airport_info: Dict) -> List[str]:
+        """Rationale clauses derived from airport data alone"""
+        fire = airport_info.get("fire_category", 0)
+        rwy = airport_info.get("runway_length_ft", 0)
+        pol = airport_info.get("political_risk")
+        hdl = airport_info.get("handling_available")
         rationale_parts = []
         
-        if airport_info.get("fire_category", 0) >= 9:
+        if fire >= 9:
             rationale_parts.append("Excellent fire/rescue capability")
         
-        if airport_info.get("runway_length_ft", 0) >= 10000:
+        if rwy >= 10000:
             rationale_parts.append("Long runway suitable for heavy aircraft")
         
-        if airport_info.get("political_risk") == "low":
+        if pol == "low":
             rationale_parts.append("Low political risk")
         
-        if airport_info.get("handling_available"):
+        if hdl:
             rationale_parts.append("Ground handling available")
         
-        # Failure-specific rationale
-        if failure_type == "engine_failure":
-            rationale_parts.append("Single-engine approach capability")
-        elif failure_type == "decompression":
-            rationale_parts.append("Suitable for emergency descent")
-        
-        return "; ".join(rationale_parts) if rationale_parts else "Standard alternate"
+        return rationale_parts
     
     def _generate_operational_notes(self, airport_info: Dict) -> List[str]:
         """Generate operational notes for the airport"""
+        icao = airport_info.get("icao")
+        if icao in self._base_notes:
+            return list(self._base_notes[icao])
+        return self._airport_operational_notes(airport_info)
+    
+    def _airport_operational_notes(self, airport_info: Dict) -> List[str]:
+        """Operational notes derived from airport data alone"""
+        fire = airport_info.get("fire_category")
+        rwy = airport_info.get("runway_length_ft", 0)
+        pol = airport_info.get("political_risk")
+        hdl = airport_info.get("handling_available")
         notes = []
         
-        if airport_info.get("fire_category", 0) < 9:
-            notes.append(f"Fire category {airport_info.get('fire_category')} - may require coordination")
+        if (fire or 0) < 9:
+            notes.append(f"Fire category {fire} - may require coordination")
         
-        if airport_info.get("runway_length_ft", 0) < 9500:
+        if rwy < 9500:
             notes.append("Runway length requires performance calculations")
         
-        if airport_info.get("political_risk") in ["medium", "high"]:
-            notes.append(f"Political risk: {airport_info.get('political_risk')} - diplomatic coordination may be needed")
+        if pol in ["medium", "high"]:
+            notes.append(f"Political risk: {pol} - diplomatic coordination may be needed")
         
-        if not airport_info.get("handling_available"):
+        if not hdl:
             notes.append("Limited ground handling - coordinate with local services")
         
         return notes
@@ -198,46 +337,45 @@ class EnhancedAlternateRanker:
         
         return va_support_levels.get(icao, {"level": "UNKNOWN", "notes": "Support level unknown"})
     
-    def _create_decision_matrix(self, airport_scores: Dict, failure_type: str) -> Dict:
+    def _create_decision_matrix(self, airport_scores: Dict, failure_type: str) -> DecisionMatrix:
         """Create decision matrix for operational use"""
         
-        matrix = {
-            "primary_choice": None,
-            "backup_choice": None,
-            "emergency_choice": None,
-            "decision_factors": []
-        }
-        
         # Sort by intelligence score
         sorted_airports = sorted(airport_scores.items(), 
                                key=lambda x: x[1]["intelligence_score"], 
                                reverse=True)
         
         suitable_airports = [
-            (icao, data) for icao, data in sorted_airports 
+            icao for icao, data in sorted_airports 
             if data["suitability"] in ["EXCELLENT", "GOOD", "ADEQUATE"]
         ]
-        
-        if suitable_airports:
-            matrix["primary_choice"] = suitable_airports[0][0]
-            
-            if len(suitable_airports) > 1:
-                matrix["backup_choice"] = suitable_airports[1][0]
-            
-            if len(suitable_airports) > 2:
-                matrix["emergency_choice"] = suitable_airports[2][0]
-        
-        # Add decision factors
-        matrix["decision_factors"] = [
-            "Airport intelligence score",
-            "Aircraft type compatibility",
-            "Fire/rescue capability",
-            "Runway length adequacy",
-            "Political risk assessment",
-            "Virgin Atlantic support level"
-        ]
-        
-        return matrix
+        choices = suitable_airports[:3] + [None] * (3 - len(suitable_airports[:3]))
+        
+        return DecisionMatrix(
+            primary_choice=choices[0],
+            backup_choice=choices[1],
+            emergency_choice=choices[2],
+            decision_factors=[
+                "Airport intelligence score",
+                "Aircraft type compatibility",
+                "Fire/rescue capability",
+                "Runway length adequacy",
+                "Political risk assessment",
+                "Virgin Atlantic support level"
+            ]
+        )
+
+# Per-process ranker used by batch_evaluate workers
+_worker_ranker: Optional[EnhancedAlternateRanker] = None
+
+def _init_worker():
+    """Build the worker's ranker once so only scenario args cross the process boundary"""
+    global _worker_ranker
+    _worker_ranker = EnhancedAlternateRanker()
+
+def _worker_eval(scenario: Dict) -> ScenarioResult:
+    """Evaluate a single scenario inside a batch_evaluate worker"""
+    return _worker_ranker.evaluate_diversion_scenario(**scenario)
 
 def main():
     """Demonstrate enhanced alternate airport ranking"""
@@ -254,24 +392,24 @@ def main():
     
     print("Enhanced Alternate Airport Ranking Report")
     print("="*50)
-    print(f"Scenario: {scenario['scenario_assessment']['failure_type']} - {scenario['scenario_assessment']['aircraft_type']}")
-    print(f"Assessment time: {scenario['scenario_assessment']['assessed_at']}")
+    print(f"Scenario: {scenario.scenario_assessment['failure_type']} - {scenario.scenario_assessment['aircraft_type']}")
+    print(f"Assessment time: {scenario.scenario_assessment['assessed_at']}")
     print()
     
     print("Recommendations:")
-    for rec in scenario["recommendations"]:
-        print(f"{rec['rank']}. {rec['airport_name']} ({rec['icao']})")
-        print(f"   Intelligence Score: {rec['intelligence_score']}")
-        print(f"   Suitability: {rec['suitability']}")
-        print(f"   Rationale: {rec['rationale']}")
-        print(f"   Virgin Atlantic Support: {rec['virgin_atlantic_support']['level']}")
+    for rec in scenario.recommendations:
+        print(f"{rec.rank}. {rec.airport_name} ({rec.icao})")
+        print(f"   Intelligence Score: {rec.intelligence_score}")
+        print(f"   Suitability: {rec.suitability}")
+        print(f"   Rationale: {rec.rationale}")
+        print(f"   Virgin Atlantic Support: {rec.virgin_atlantic_support['level']}")
         print()
     
     print("Decision Matrix:")
-    matrix = scenario["decision_matrix"]
-    print(f"Primary Choice: {matrix['primary_choice']}")
-    print(f"Backup Choice: {matrix['backup_choice']}")
-    print(f"Emergency Choice: {matrix['emergency_choice']}")
+    matrix = scenario.decision_matrix
+    print(f"Primary Choice: {matrix.primary_choice}")
+    print(f"Backup Choice: {matrix.backup_choice}")
+    print(f"Emergency Choice: {matrix.emergency_choice}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
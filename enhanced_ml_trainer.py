@@ -7,23 +7,128 @@ Trains models using the enhanced feature set with METAR weather data
 import pandas as pd
 import numpy as np
 import joblib
+import gc
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import classification_report, accuracy_score
 import logging
 
+# Optional: fast JSON encoder with native numpy scalar support
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+# Optional: lz4 gives fast model compression; zlib is always available
+try:
+    import lz4.frame  # noqa: F401  (joblib looks the codec up by name)
+    MODEL_COMPRESSION = ('lz4', 3)
+except ImportError:
+    MODEL_COMPRESSION = ('zlib', 3)
+
+# Optional: pyarrow gives pandas a multithreaded CSV parser; the C parser is used otherwise
+try:
+    import pyarrow  # noqa: F401  (pandas looks the engine up by name)
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Optional: numba compiles the weather scorer; the NumPy version is used otherwise
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    numba = None
+    NUMBA_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+def _score_metar_numpy(visibility, wind, precip, cloud):
+    """
+    Vectorised approximation of MetarWeatherService.get_weather_score from
+    features already extracted from METAR (visibility in SM, wind in kt,
+    condition flags)
+    
+    The raw report is gone by this point, so the scores can differ from the
+    string rules: weather_conditions is one category, so precipitation/fog and
+    cloud never both score; visibility below 1 SM stands in for the 800/600/
+    400/200 m tokens; and any wind of 25 kt or more stands in for the exact
+    25/30/35/40KT tokens.
+    """
+    score = (np.where(precip, 0.4, 0.0) + np.where(cloud, 0.3, 0.0)
+             + np.where(visibility < 1.0, 0.2, 0.0) + np.where(wind >= 25.0, 0.2, 0.0))
+    return np.minimum(score, 1.0).astype(np.float32)
+
+if NUMBA_AVAILABLE:
+    @numba.njit(parallel=True, cache=True)
+    def _score_metar(visibility, wind, precip, cloud):
+        # Compiled twin of _score_metar_numpy, with the same approximations
+        out = np.empty(visibility.shape[0], np.float32)
+        for i in numba.prange(visibility.shape[0]):
+            score = 0.0
+            if precip[i]:
+                score += 0.4
+            if cloud[i]:
+                score += 0.3
+            if visibility[i] < 1.0:
+                score += 0.2
+            if wind[i] >= 25.0:
+                score += 0.2
+            out[i] = min(score, 1.0)
+        return out
+else:
+    _score_metar = _score_metar_numpy
+
 class EnhancedMLTrainer:
     """Enhanced ML trainer with METAR weather features"""
     
-    def __init__(self, buffer_file='enhanced_buffer.csv', model_file='enhanced_delay_model.pkl'):
+    # Fill values for feature columns absent from the buffer
+    FEATURE_DEFAULTS = {
+        'weather_score': 0.2,
+        'departure_delay_mins': 0.0,
+        'enroute_time_min': 0.0,
+        'altitude': 35000,
+        'ground_speed': 450,
+        'lat': 51.5,
+        'lon': -1.0,
+        'day_of_week': 0,
+        'hour_of_day': 0
+    }
+    
+    # Extracted METAR fields (see metar_weather.extract_weather_features) from
+    # which weather_score can be derived when the buffer lacks it
+    RAW_WEATHER_COLUMNS = ['weather_visibility', 'weather_wind_speed', 'weather_conditions']
+    
+    # Below this many samples in the rarest class, use a plain shuffled split
+    MIN_STRATIFY_CLASS_COUNT = 20
+    
+    # Upper bound on the bootstrap sample each forest tree is grown on
+    MAX_TREE_SAMPLES = 10000
+    
+    # Trees (or boosting iterations) added per incremental refresh
+    WARM_START_ESTIMATORS = 20
+    
+    # Fewest records unseen by the saved model needed to warm-start it; the
+    # hold-out set is drawn from these so no estimator has trained on it
+    MIN_WARM_START_RECORDS = 10
+    
+    def __init__(self, buffer_file='enhanced_buffer.csv', model_file='enhanced_delay_model.pkl',
+                 model_type='random_forest'):
+        """
+        model_type: 'random_forest' (default) or 'hist_gradient_boosting', which
+        bins features to uint8 histograms and trains with far less memory traffic
+        """
+        if model_type not in ('random_forest', 'hist_gradient_boosting'):
+            raise ValueError(f"Unsupported model_type: {model_type}")
+        self.model_type = model_type
         self.buffer_file = buffer_file
         self.model_file = model_file
+        self.cache_file = buffer_file + '.parquet'
         self.feature_columns = [
             'departure_delay_mins', 'enroute_time_min', 'altitude',
             'ground_speed', 'lat', 'lon', 'day_of_week',
@@ -31,49 +136,82 @@ class EnhancedMLTrainer:
         ]
         self.target_column = 'delay_label'
     
+    def _read_buffer_csv(self) -> pd.DataFrame:
+        """Parse only the feature, target and raw weather columns, with the Arrow CSV reader when installed"""
+        wanted = self.feature_columns + [self.target_column] + self.RAW_WEATHER_COLUMNS
+        # Columns absent from this buffer are skipped here; _clean_buffer fills them in
+        header = pd.read_csv(self.buffer_file, nrows=0).columns
+        present = [col for col in wanted if col in header]
+        engine = 'pyarrow' if PYARROW_AVAILABLE else 'c'
+        return pd.read_csv(self.buffer_file, engine=engine, usecols=present)
+    
+    @staticmethod
+    def _coerce_numeric(column: pd.Series, default: float) -> np.ndarray:
+        """Parse a column as float32 and replace unparseable/missing values in one array pass"""
+        raw = pd.to_numeric(column, errors='coerce').to_numpy(dtype=np.float32, copy=False)
+        return np.where(np.isnan(raw), np.float32(default), raw)
+    
+    def _clean_buffer(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Coerce numeric fields and fill in any missing feature/target columns"""
+        # Collect every cleaned/added column and write them in a single assign,
+        # so pandas consolidates once instead of fragmenting per column
+        # Clean data - fix non-numeric values, replacing NaN with defaults
+        updates = {
+            'altitude': self._coerce_numeric(df['altitude'], 35000),
+            'ground_speed': self._coerce_numeric(df['ground_speed'], 450)
+        }
+        
+        # Approximate weather_score from extracted METAR fields in one compiled pass
+        if 'weather_score' not in df.columns and all(col in df.columns for col in self.RAW_WEATHER_COLUMNS):
+            conditions = df['weather_conditions'].to_numpy(dtype=str)
+            updates['weather_score'] = _score_metar(
+                self._coerce_numeric(df['weather_visibility'], 10.0),
+                self._coerce_numeric(df['weather_wind_speed'], 5.0),
+                np.isin(conditions, ('precipitation', 'fog')),
+                conditions == 'cloudy'
+            )
+        
+        # Ensure all feature columns exist, adding defaults for the rest
+        missing_cols = [col for col in self.feature_columns if col not in df.columns and col not in updates]
+        if missing_cols:
+            logger.warning(f"Missing columns {missing_cols}, adding default values")
+            updates.update({col: self.FEATURE_DEFAULTS[col] for col in missing_cols})
+        
+        # Ensure target column exists
+        if self.target_column not in df.columns:
+            logger.warning("Missing delay_label, creating from data")
+            updates[self.target_column] = 0  # Default to on-time
+        
+        return df.assign(**updates)
+    
     def load_enhanced_data(self) -> tuple:
-        """Load enhanced data with METAR weather features"""
+        """
+        Load enhanced data with METAR weather features
+        
+        The cleaned frame is checkpointed to <buffer_file>.parquet and reused
+        until the CSV buffer is modified again.
+        """
         try:
-            df = pd.read_csv(self.buffer_file)
-            logger.info(f"Loaded {len(df)} records from enhanced buffer")
-            
-            if len(df) < 10:
-                raise ValueError("Insufficient data for training. Need at least 10 records.")
-            
-            # Clean data - fix non-numeric values
-            # Fix altitude column
-            df['altitude'] = pd.to_numeric(df['altitude'], errors='coerce')
-            df['altitude'] = df['altitude'].fillna(35000)  # Replace NaN with default
-            
-            # Fix ground_speed column
-            df['ground_speed'] = pd.to_numeric(df['ground_speed'], errors='coerce') 
-            df['ground_speed'] = df['ground_speed'].fillna(450)  # Replace NaN with default
+            if (os.path.exists(self.cache_file)
+                    and os.path.getmtime(self.cache_file) >= os.path.getmtime(self.buffer_file)):
+                df = pd.read_parquet(self.cache_file)
+                logger.info(f"Loaded {len(df)} cleaned records from {self.cache_file}")
+            else:
+                df = self._read_buffer_csv()
+                logger.info(f"Loaded {len(df)} records from enhanced buffer")
+                
+                if len(df) < 10:
+                    raise ValueError("Insufficient data for training. Need at least 10 records.")
+                
+                df = self._clean_buffer(df)
+                try:
+                    df.to_parquet(self.cache_file, compression='snappy', index=False)
+                except Exception as e:
+                    logger.warning(f"Could not write training cache {self.cache_file}: {e}")
             
-            # Ensure all feature columns exist
-            for col in self.feature_columns:
-                if col not in df.columns:
-                    logger.warning(f"Missing column {col}, adding default values")
-                    if col == 'weather_score':
-                        df[col] = 0.2
-                    elif col in ['departure_delay_mins', 'enroute_time_min']:
-                        df[col] = 0.0
-                    elif col in ['altitude']:
-                        df[col] = 35000
-                    elif col in ['ground_speed']:
-                        df[col] = 450
-                    elif col in ['lat']:
-                        df[col] = 51.5
-                    elif col in ['lon']:
-                        df[col] = -1.0
-                    else:
-                        df[col] = 0
-            
-            # Ensure target column exists
-            if self.target_column not in df.columns:
-                logger.warning("Missing delay_label, creating from data")
-                df['delay_label'] = 0  # Default to on-time
-            
-            X = df[self.feature_columns]
+            # float32 is the dtype sklearn's tree splitter works in, and it scans
+            # one feature column at a time; converting here avoids copies inside fit
+            X = np.asfortranarray(df[self.feature_columns].to_numpy(dtype=np.float32))
             y = df[self.target_column]
             
             return X, y, df
@@ -82,48 +220,191 @@ class EnhancedMLTrainer:
             logger.error(f"Error loading data: {e}")
             raise
     
-    def train_enhanced_model(self) -> dict:
-        """Train enhanced model with METAR weather features"""
-        X, y, df = self.load_enhanced_data()
+    def _build_model(self, n_samples: int):
+        """Construct the configured classifier for a training set of n_samples rows"""
+        from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
         
-        # Split data
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=0.2, random_state=42, stratify=y
-        )
+        if self.model_type == 'hist_gradient_boosting':
+            return HistGradientBoostingClassifier(
+                max_iter=200,
+                max_depth=10,
+                learning_rate=0.1,
+                early_stopping=True,
+                random_state=42
+            )
         
         # Train Random Forest model
-        model = RandomForestClassifier(
+        return RandomForestClassifier(
             n_estimators=100,
             max_depth=10,
             random_state=42,
-            class_weight='balanced'
+            max_samples=min(1.0, self.MAX_TREE_SAMPLES / n_samples),  # Cap per-tree fit cost on large buffers
+            oob_score=True,  # Accuracy from bootstrap leave-out rows; no test split needed
+            n_jobs=-1  # Fit and predict trees across all cores
         )
+    
+    def _feature_importances(self, model, X_test, y_test) -> np.ndarray:
+        """
+        Impurity importances for forests; permutation importances on the hold-out
+        set for histogram GBMs (forests have no hold-out set, X_test/y_test are None)
+        """
+        if hasattr(model, 'feature_importances_'):
+            return model.feature_importances_
         
-        model.fit(X_train, y_train)
+        from sklearn.inspection import permutation_importance
+        return permutation_importance(model, X_test, y_test, n_repeats=5, random_state=42).importances_mean
+    
+    def _load_incremental_model(self):
+        """
+        Reload the previous model and extend it by WARM_START_ESTIMATORS so that
+        fit only grows the new trees/iterations; None when no compatible model exists
+        """
+        if not os.path.exists(self.model_file):
+            return None
         
-        # Evaluate model
-        y_pred = model.predict(X_test)
-        accuracy = accuracy_score(y_test, y_pred)
+        from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
+        try:
+            model = joblib.load(self.model_file)
+        except Exception as e:
+            logger.warning(f"Could not load {self.model_file} for incremental training: {e}")
+            return None
         
-        # Feature importance
-        feature_importance = dict(zip(self.feature_columns, model.feature_importances_))
+        if self.model_type == 'random_forest' and isinstance(model, RandomForestClassifier):
+            # OOB would rebuild the old trees' bootstrap indices against the new
+            # rows and score them on records they were fit on
+            model.set_params(warm_start=True, oob_score=False,
+                             n_estimators=model.n_estimators + self.WARM_START_ESTIMATORS)
+        elif self.model_type == 'hist_gradient_boosting' and isinstance(model, HistGradientBoostingClassifier):
+            model.set_params(warm_start=True, max_iter=model.max_iter + self.WARM_START_ESTIMATORS)
+        else:
+            return None
+        # Older models carried class_weight; balancing now comes from sample_weight
+        model.set_params(class_weight=None)
+        return model
+    
+    def _row_hashes(self, df: pd.DataFrame) -> np.ndarray:
+        """Content hash of each record's features and target, stable across buffer refreshes"""
+        return pd.util.hash_pandas_object(
+            df[self.feature_columns + [self.target_column]], index=False
+        ).to_numpy()
+    
+    def _write_metadata(self, metadata: dict) -> None:
+        """Write training metadata alongside the model"""
+        if ORJSON_AVAILABLE:
+            with open('enhanced_model_metadata.json', 'wb') as f:
+                f.write(orjson.dumps(metadata, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            with open('enhanced_model_metadata.json', 'w') as f:
+                json.dump(metadata, f, indent=2)
+    
+    def train_enhanced_model(self, incremental: bool = False) -> dict:
+        """
+        Train enhanced model with METAR weather features
         
-        # Save model and metadata
-        joblib.dump(model, self.model_file)
+        With incremental=True the previously saved model is warm-started and only
+        the additional estimators are fit on the refreshed buffer. Accuracy is then
+        measured on a hold-out of records the saved model never trained on; with too
+        few such records the model is trained from scratch instead.
+        """
+        # sklearn is imported on first use so data loading alone stays light
+        from sklearn.model_selection import train_test_split
+        from sklearn.metrics import accuracy_score
+        from sklearn.utils.class_weight import compute_sample_weight
         
-        metadata = {
-            'model_accuracy': accuracy,
-            'feature_count': len(self.feature_columns),
-            'feature_columns': self.feature_columns,
-            'training_date': datetime.now().isoformat(),
-            'training_records': len(df),
-            'feature_importance': feature_importance,
-            'weather_integration': True,
-            'metar_enhanced': True
-        }
+        X, y, df = self.load_enhanced_data()
         
-        with open('enhanced_model_metadata.json', 'w') as f:
-            json.dump(metadata, f, indent=2)
+        y = y.to_numpy()
+        row_hashes = self._row_hashes(df)
+        
+        model = self._load_incremental_model() if incremental else None
+        if model is not None:
+            # The saved estimators were fit on an earlier buffer; only records none of
+            # them saw can be held out (models saved without hashes count as seen all)
+            seen = getattr(model, 'training_row_hashes_', row_hashes)
+            unseen = np.unique(row_hashes[~np.isin(row_hashes, seen)])
+            if len(unseen) < self.MIN_WARM_START_RECORDS:
+                logger.info(f"Only {len(unseen)} new records since the saved model; training from scratch")
+                model = None
+        
+        # Forests score themselves on each tree's out-of-bag rows, so fresh fits train on
+        # every record and skip the hold-out split and its separate predict pass
+        use_oob = model is None and self.model_type == 'random_forest'
+        if model is not None:
+            # Hold out by hash so duplicate records cannot land on both sides
+            test_hashes = np.random.default_rng(42).permutation(unseen)[:len(unseen) // 5]
+            in_test = np.isin(row_hashes, test_hashes)
+            train_idx, test_idx = np.flatnonzero(~in_test), np.flatnonzero(in_test)
+        elif use_oob:
+            train_idx = test_idx = None
+        # Split data; stratify only when every class is large enough for it to matter
+        elif np.unique(y, return_counts=True)[1].min() < self.MIN_STRATIFY_CLASS_COUNT:
+            idx = np.random.default_rng(42).permutation(len(y))
+            cut = int(0.8 * len(y))
+            train_idx, test_idx = idx[:cut], idx[cut:]
+        else:
+            train_idx, test_idx = train_test_split(
+                np.arange(len(y)), test_size=0.2, random_state=42, stratify=y
+            )
+        
+        if train_idx is None:
+            X_train, y_train = X, y
+            X_test = y_test = None
+            trained_hashes = row_hashes
+        else:
+            X_train, X_test = X[train_idx], X[test_idx]
+            y_train, y_test = y[train_idx], y[test_idx]
+            trained_hashes = row_hashes[train_idx]
+        
+        # Row indexing during the split yields C-ordered copies; restore column-major for fit
+        X_train = np.asfortranarray(X_train)
+        
+        if model is None:
+            model = self._build_model(len(X_train))
+        # Balance classes with weights computed once, rather than per tree/iteration
+        model.fit(X_train, y_train, sample_weight=compute_sample_weight('balanced', y_train))
+        # Saved with the model so the next incremental run can find unseen records
+        model.training_row_hashes_ = np.unique(trained_hashes)
+        
+        # Release the training data before pickling so it does not add to peak RSS;
+        # only the (possibly empty) hold-out set is still needed for evaluation
+        n_records = len(df)
+        del X, y, df, X_train, y_train, row_hashes, trained_hashes
+        gc.collect()
+        
+        # Persist the model on a background thread while the main thread evaluates it
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            model_saved = executor.submit(
+                joblib.dump, model, self.model_file, compress=MODEL_COMPRESSION, protocol=5
+            )
+            
+            # Evaluate model
+            if use_oob:
+                accuracy = model.oob_score_
+            else:
+                y_pred = model.predict(X_test)
+                accuracy = accuracy_score(y_test, y_pred)
+            
+            # Feature importance
+            feature_importance = dict(zip(self.feature_columns, self._feature_importances(model, X_test, y_test)))
+            
+            metadata = {
+                'model_accuracy': accuracy,
+                'accuracy_method': 'out_of_bag' if use_oob else 'holdout',
+                'feature_count': len(self.feature_columns),
+                'feature_columns': self.feature_columns,
+                'training_date': datetime.now().isoformat(),
+                'training_records': n_records,
+                'model_type': self.model_type,
+                'feature_importance': feature_importance,
+                'weather_integration': True,
+                'metar_enhanced': True
+            }
+            
+            metadata_saved = executor.submit(self._write_metadata, metadata)
+            
+            # Surface any write errors before reporting success
+            model_saved.result()
+            metadata_saved.result()
         
         logger.info(f"Enhanced model trained successfully - Accuracy: {accuracy:.3f}")
         
@@ -143,12 +424,16 @@ def main():
         print(f"🌤️  Weather integration: {metadata['weather_integration']}")
         print(f"📈 Feature importance (top 3):")
         
-        # Sort features by importance
+        # Partially select the top features by importance, then order just those
         importance = metadata['feature_importance']
-        sorted_features = sorted(importance.items(), key=lambda x: x[1], reverse=True)
+        features = list(importance)
+        scores = np.fromiter(importance.values(), dtype=float, count=len(features))
+        k = min(3, len(features))
+        top = np.argpartition(scores, -k)[-k:]
+        top = top[np.argsort(scores[top])[::-1]]
         
-        for i, (feature, score) in enumerate(sorted_features[:3]):
-            print(f"   {i+1}. {feature}: {score:.3f}")
+        for i, idx in enumerate(top):
+            print(f"   {i+1}. {features[idx]}: {scores[idx]:.3f}")
             
     except Exception as e:
         print(f"❌ Training failed: {e}")
@@ -5,9 +5,17 @@ Integrates with digital twin profiles and failure modeling system
 Provides comprehensive failure scenario simulation with operational intelligence
 """
 
+import bisect
+import copy
+import functools
+import itertools
 import json
 import os
 import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from types import MappingProxyType
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 import logging
@@ -16,12 +24,258 @@ import logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Failure type identifiers, interned so comparisons against them (and against
+# failure types interned on entry to simulate_failure) are identity checks
+ENGINE_FAILURE = sys.intern("engine_failure")
+DECOMPRESSION = sys.intern("decompression")
+HYDRAULIC_FAILURE = sys.intern("hydraulic_failure")
+SINGLE_ENGINE_LANDING = sys.intern("single_engine_landing")
+
+@dataclass(slots=True, frozen=True)
+class FailureParameters:
+    """
+    Numeric parameters of one failure mode read on every scenario, parsed once
+    from the profile dict with the simulator's defaults applied. Descriptive,
+    aircraft-specific entries stay in the profile dict.
+    """
+    fuel_penalty_factor: float = 1.0
+    landing_distance_factor: float = 1.0
+    speed_knots: Optional[int] = None
+    diversion_required: bool = False
+    target_altitude_ft: Optional[int] = None  # None: the failure does not change altitude
+    systems_lost: frozenset = frozenset()  # For membership tests; the profile keeps the ordered list
+    
+    @classmethod
+    def from_profile(cls, failure_type: str, failure: Dict) -> "FailureParameters":
+        if failure_type == DECOMPRESSION:
+            target_altitude_ft = failure.get("descent_altitude_ft", 10000)
+        elif failure_type == ENGINE_FAILURE:
+            target_altitude_ft = failure.get("drift_down_altitude_ft")
+        else:
+            target_altitude_ft = None
+        
+        return cls(
+            fuel_penalty_factor=failure.get("fuel_penalty_factor", 1.0),
+            landing_distance_factor=failure.get("landing_distance_factor", 1.0),
+            speed_knots=failure.get("speed_knots", None),
+            diversion_required=failure.get("diversion_required", False),
+            target_altitude_ft=target_altitude_ft,
+            systems_lost=frozenset(failure.get("systems_lost", ()))
+        )
+
+def _parse_failure_parameters(profile: Dict) -> Dict[str, FailureParameters]:
+    """FailureParameters for every failure mode in a digital twin profile"""
+    return {
+        failure_type: FailureParameters.from_profile(failure_type, failure)
+        for failure_type, failure in profile.items()
+        if isinstance(failure, dict)
+    }
+
+# Optional AINO components; scenarios fall back to static data without them
+try:
+    from alternate_airport_ranking import AlternateAirportRanker
+except ImportError:
+    AlternateAirportRanker = None
+
+try:
+    from post_failure_actions import PostFailureActionsManager
+except ImportError:
+    PostFailureActionsManager = None
+
+# Optional: fast JSON parser/encoder for profiles and scenario exports
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+@functools.cache
+def _severity(failure_type: str, phase: str) -> str:
+    """Severity for a failure type in a flight phase; the domain is failure types x 5 phases"""
+    return EnhancedScenarioSimulator._SEVERITY_MATRIX.get(failure_type, {}).get(phase, "MEDIUM")
+
+# Scenario IDs are "<flight>_<failure>_<session stamp>_<sequence>"
+_SESSION_STAMP = datetime.now().strftime('%Y%m%d_%H%M%S')
+_scenario_counter = itertools.count(1)
+
+# Background writers for export_scenario; flush_exports() waits for pending writes.
+# Each Future leaves _PENDING_EXPORTS as soon as it completes.
+_EXPORT_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="scenario-export")
+_PENDING_EXPORTS = set()
+_PENDING_EXPORTS_LOCK = threading.Lock()
+
+def _discard_export(future: Future) -> None:
+    """Done-callback that drops a finished export from _PENDING_EXPORTS"""
+    with _PENDING_EXPORTS_LOCK:
+        _PENDING_EXPORTS.discard(future)
+
+def _export_json(filename: str, data: Dict) -> Optional[str]:
+    """Write one scenario export, returning the filename or None on failure"""
+    try:
+        _write_json(filename, data)
+        logger.info("Scenario exported to %s", filename)
+        return filename
+    except Exception as e:
+        logger.error("Error exporting scenario: %s", e)
+        return None
+
+def _fuel_impact_core(fuel_penalty_factor: float, remaining_distance: float) -> tuple:
+    """Return (burn penalty per hour, extra fuel in gallons, unrounded range impact %)"""
+    expected_fuel_burn_penalty_per_hour = fuel_penalty_factor - 1.0
+    base_consumption = remaining_distance * 0.8  # Rough estimate: 0.8 gallons per nm
+    extra_fuel_gallons = int(expected_fuel_burn_penalty_per_hour * base_consumption)
+    return expected_fuel_burn_penalty_per_hour, extra_fuel_gallons, expected_fuel_burn_penalty_per_hour * 100
+
+@functools.lru_cache(maxsize=32)
+def _resolve_profile_path(aircraft_type: str) -> Optional[str]:
+    """Return the first existing digital twin profile path for an aircraft type"""
+    # Normalize aircraft type for file naming
+    normalized_type = aircraft_type.replace('-', '_')
+    filename = f"{normalized_type}_digital_twin.json"
+    
+    # Check multiple possible locations
+    possible_paths = [
+        os.path.join("digital_twin_profiles", filename),
+        os.path.join("attached_assets", "digital_twin_extracted", filename),
+        filename  # Current directory
+    ]
+    
+    for filepath in possible_paths:
+        if os.path.exists(filepath):
+            return filepath
+    return None
+
+@functools.lru_cache(maxsize=32)
+def _load_profile(filepath: str, mtime: float) -> Dict:
+    """Parse a profile file; mtime is part of the cache key so edits are picked up"""
+    if ORJSON_AVAILABLE:
+        with open(filepath, "rb") as f:
+            return orjson.loads(f.read())
+    with open(filepath, "r") as f:
+        return json.load(f)
+
+def _write_json(filename: str, data: Dict) -> None:
+    """Write indented JSON, using orjson when installed"""
+    if ORJSON_AVAILABLE:
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(filename, 'w') as f:
+            json.dump(data, f, indent=2)
+
+# Virgin Atlantic route database
+VIRGIN_ATLANTIC_ROUTES = MappingProxyType({
+    'LHR-JFK': {'distance_nm': 3440, 'duration_hr': 8.5, 'freq_daily': 3},
+    'LHR-ATL': {'distance_nm': 4200, 'duration_hr': 9.0, 'freq_daily': 2},
+    'LHR-BOS': {'distance_nm': 3260, 'duration_hr': 8.0, 'freq_daily': 2},
+    'LHR-LAX': {'distance_nm': 5440, 'duration_hr': 11.5, 'freq_daily': 1},
+    'LHR-MIA': {'distance_nm': 4420, 'duration_hr': 9.5, 'freq_daily': 1},
+    'LHR-MCO': {'distance_nm': 4150, 'duration_hr': 9.0, 'freq_daily': 2},
+    'LHR-LAS': {'distance_nm': 5210, 'duration_hr': 11.0, 'freq_daily': 1},
+    'LHR-SFO': {'distance_nm': 5350, 'duration_hr': 11.0, 'freq_daily': 1},
+    'LHR-IAD': {'distance_nm': 3670, 'duration_hr': 8.5, 'freq_daily': 1},
+    'MAN-ATL': {'distance_nm': 4180, 'duration_hr': 9.0, 'freq_daily': 1},
+    'MAN-JFK': {'distance_nm': 3330, 'duration_hr': 8.0, 'freq_daily': 1},
+    'LHR-DEL': {'distance_nm': 4180, 'duration_hr': 8.5, 'freq_daily': 1},
+    'LHR-BOM': {'distance_nm': 4480, 'duration_hr': 9.0, 'freq_daily': 1}
+})
+
+# Shared alternate airport ranker, created on first diversion analysis
+_RANKER = None
+
+def _get_ranker():
+    """Return the process-wide AlternateAirportRanker, creating it on first use"""
+    global _RANKER
+    if _RANKER is None:
+        if AlternateAirportRanker is None:
+            raise ImportError("alternate_airport_ranking module not available")
+        _RANKER = AlternateAirportRanker()
+    return _RANKER
+
+@functools.lru_cache(maxsize=128)
+def _rank_alternates(failure_type: str, aircraft_type: str, flight_number: str, profile_key: str) -> tuple:
+    """
+    Ranked alternates and diversion report for a failure profile, memoized on
+    (failure_type, aircraft_type, flight_number, serialized profile)
+    """
+    ranker = _get_ranker()
+    
+    # Get failure profile for ranking
+    failure_profile = json.loads(profile_key)
+    failure_profile["type"] = failure_type
+    
+    # Get ranked alternates
+    recommended = ranker.get_recommended_alternates(failure_profile, aircraft_type, max_results=5)
+    suitable_airports = [alt["icao"] for alt in recommended]
+    
+    # Generate diversion report
+    diversion_report = ranker.generate_diversion_report(failure_profile, aircraft_type, flight_number)
+    return suitable_airports, diversion_report
+
+# The actions manager holds only its static action matrix, so one instance is shared
+_ACTIONS_MANAGER = PostFailureActionsManager() if PostFailureActionsManager is not None else None
+
 class EnhancedScenarioSimulator:
     """
     Enhanced scenario simulator for AINO aviation intelligence platform
     Integrates with authentic digital twin profiles and operational data
     """
     
+    # Per-failure reference data; read-only and shared by every simulator.
+    # Sequences are stored as tuples and copied into lists when returned.
+    
+    # Flight phase by route progress: progress below _PHASE_BOUNDS[i] is _PHASES[i]
+    _PHASE_BOUNDS = (10, 30, 70, 90)
+    _PHASES = ("DEPARTURE", "CLIMB", "CRUISE", "DESCENT", "APPROACH")
+    
+    # Failure severity by failure type and flight phase
+    _SEVERITY_MATRIX = MappingProxyType({
+        "engine_failure": MappingProxyType({"DEPARTURE": "CRITICAL", "CLIMB": "HIGH", "CRUISE": "MEDIUM", "DESCENT": "HIGH", "APPROACH": "CRITICAL"}),
+        "decompression": MappingProxyType({"DEPARTURE": "CRITICAL", "CLIMB": "CRITICAL", "CRUISE": "HIGH", "DESCENT": "HIGH", "APPROACH": "CRITICAL"}),
+        "hydraulic_failure": MappingProxyType({"DEPARTURE": "MEDIUM", "CLIMB": "MEDIUM", "CRUISE": "LOW", "DESCENT": "MEDIUM", "APPROACH": "HIGH"}),
+        "single_engine_landing": MappingProxyType({"DEPARTURE": "CRITICAL", "CLIMB": "CRITICAL", "CRUISE": "HIGH", "DESCENT": "HIGH", "APPROACH": "HIGH"})
+    })
+    
+    _DESCRIPTIONS = MappingProxyType({
+        "engine_failure": "Engine failure requiring single-engine operations",
+        "decompression": "Cabin pressurization failure requiring emergency descent",
+        "hydraulic_failure": "Hydraulic system failure affecting flight controls and landing gear",
+        "single_engine_landing": "Single-engine approach and landing procedures"
+    })
+    
+    _PASSENGER_IMPACT = MappingProxyType({
+        "engine_failure": MappingProxyType({"comfort": "MODERATE", "safety": "LOW", "schedule": "HIGH"}),
+        "decompression": MappingProxyType({"comfort": "HIGH", "safety": "MEDIUM", "schedule": "HIGH"}),
+        "hydraulic_failure": MappingProxyType({"comfort": "LOW", "safety": "LOW", "schedule": "MEDIUM"}),
+        "single_engine_landing": MappingProxyType({"comfort": "MODERATE", "safety": "MEDIUM", "schedule": "LOW"})
+    })
+    _DEFAULT_PASSENGER_IMPACT = MappingProxyType({"comfort": "LOW", "safety": "LOW", "schedule": "LOW"})
+    
+    _REG_CONSIDERATIONS = MappingProxyType({
+        "engine_failure": (
+            "ETOPS regulations may apply",
+            "Report to manufacturer and authority",
+            "Enhanced inspection requirements"
+        ),
+        "decompression": (
+            "Mandatory occurrence report",
+            "Cabin altitude exceeded certification limits",
+            "Medical assessment required"
+        ),
+        "hydraulic_failure": (
+            "System redundancy analysis required",
+            "Maintenance inspection mandatory",
+            "Component replacement needed"
+        )
+    })
+    
+    _DIVERSION_REQS = MappingProxyType({
+        "hydraulic_failure": ("Long runway", "Arresting gear available", "Emergency services"),
+        "engine_failure": ("Maintenance capability", "Long runway", "Emergency services"),
+        "decompression": ("Medical facilities", "Low altitude approach", "Emergency services")
+    })
+    
     def __init__(self, aircraft_type: str, origin: str, destination: str, 
                  position_nm_from_origin: float, altitude_ft: int, 
                  registration: str = None, flight_number: str = None):
@@ -47,28 +301,13 @@ class EnhancedScenarioSimulator:
         
         # Load digital twin profile
         self.twin_profile = self.load_twin_profile(aircraft_type)
+        self.failure_params = _parse_failure_parameters(self.twin_profile)
         
         # Initialize result container
         self.result = {}
+        self._stamp = None  # Session stamp and sequence number of the last simulation
         
-        # Virgin Atlantic route database
-        self.virgin_atlantic_routes = {
-            'LHR-JFK': {'distance_nm': 3440, 'duration_hr': 8.5, 'freq_daily': 3},
-            'LHR-ATL': {'distance_nm': 4200, 'duration_hr': 9.0, 'freq_daily': 2},
-            'LHR-BOS': {'distance_nm': 3260, 'duration_hr': 8.0, 'freq_daily': 2},
-            'LHR-LAX': {'distance_nm': 5440, 'duration_hr': 11.5, 'freq_daily': 1},
-            'LHR-MIA': {'distance_nm': 4420, 'duration_hr': 9.5, 'freq_daily': 1},
-            'LHR-MCO': {'distance_nm': 4150, 'duration_hr': 9.0, 'freq_daily': 2},
-            'LHR-LAS': {'distance_nm': 5210, 'duration_hr': 11.0, 'freq_daily': 1},
-            'LHR-SFO': {'distance_nm': 5350, 'duration_hr': 11.0, 'freq_daily': 1},
-            'LHR-IAD': {'distance_nm': 3670, 'duration_hr': 8.5, 'freq_daily': 1},
-            'MAN-ATL': {'distance_nm': 4180, 'duration_hr': 9.0, 'freq_daily': 1},
-            'MAN-JFK': {'distance_nm': 3330, 'duration_hr': 8.0, 'freq_daily': 1},
-            'LHR-DEL': {'distance_nm': 4180, 'duration_hr': 8.5, 'freq_daily': 1},
-            'LHR-BOM': {'distance_nm': 4480, 'duration_hr': 9.0, 'freq_daily': 1}
-        }
-        
-        logger.info(f"Enhanced Scenario Simulator initialized for {aircraft_type} on {origin}-{destination}")
+        logger.info("Enhanced Scenario Simulator initialized for %s on %s-%s", aircraft_type, origin, destination)
 
     def load_twin_profile(self, aircraft_type: str) -> Dict:
         """
@@ -80,33 +319,23 @@ class EnhancedScenarioSimulator:
         Returns:
             Digital twin profile dictionary
         """
-        # Normalize aircraft type for file naming
-        normalized_type = aircraft_type.replace('-', '_')
-        filename = f"{normalized_type}_digital_twin.json"
-        
-        # Check multiple possible locations
-        possible_paths = [
-            os.path.join("digital_twin_profiles", filename),
-            os.path.join("attached_assets", "digital_twin_extracted", filename),
-            filename  # Current directory
-        ]
-        
-        for filepath in possible_paths:
-            if os.path.exists(filepath):
-                try:
-                    with open(filepath, "r") as f:
-                        profile = json.load(f)
-                        logger.info(f"Loaded digital twin profile from {filepath}")
-                        return profile
-                except Exception as e:
-                    logger.error(f"Error loading profile from {filepath}: {e}")
-                    continue
+        filepath = _resolve_profile_path(aircraft_type)
+        if filepath:
+            try:
+                # Profiles are parsed once per file version and shared across
+                # simulators; each instance gets its own copy to mutate freely
+                profile = copy.deepcopy(_load_profile(filepath, os.path.getmtime(filepath)))
+                logger.info("Loaded digital twin profile from %s", filepath)
+                return profile
+            except Exception as e:
+                logger.error("Error loading profile from %s: %s", filepath, e)
         
         # If no profile found, create a basic fallback
-        logger.warning(f"No digital twin profile found for {aircraft_type}, using fallback")
+        logger.warning("No digital twin profile found for %s, using fallback", aircraft_type)
         return self.create_fallback_profile()
 
-    def create_fallback_profile(self) -> Dict:
+    @staticmethod
+    def create_fallback_profile() -> Dict:
         """Create a basic fallback profile when specific aircraft profile isn't available"""
         return {
             "engine_failure": {
@@ -150,19 +379,30 @@ class EnhancedScenarioSimulator:
         """
         if failure_type not in self.twin_profile:
             raise ValueError(f"{failure_type} not found in digital twin profile for {self.aircraft_type}")
+        failure_type = sys.intern(failure_type)
+        
+        # Session stamp plus a process-wide sequence number keeps IDs and export
+        # names unique even for several scenarios within the same second
+        self._stamp = f"{_SESSION_STAMP}_{next(_scenario_counter):06d}"
         
         failure = self.twin_profile[failure_type]
+        params = self.failure_params[failure_type]
         route_key = f"{self.origin}-{self.destination}"
-        route_info = self.virgin_atlantic_routes.get(route_key, {})
+        route_info = VIRGIN_ATLANTIC_ROUTES.get(route_key, {})
         
         # Calculate progress and remaining distance
         total_distance = route_info.get('distance_nm', 3500)  # Default if route not found
         progress_percent = (self.position_nm_from_origin / total_distance) * 100
         remaining_distance = total_distance - self.position_nm_from_origin
         
+        # Derive shared values once and hand them to the helpers that need them
+        phase = self.determine_flight_phase(progress_percent)
+        severity = self.calculate_failure_severity(failure_type, progress_percent, phase=phase)
+        diversion_analysis = self.analyze_diversion_options(failure_type, progress_percent, severity=severity)
+        
         # Base scenario result
         self.result = {
-            "scenario_id": f"{self.flight_number}_{failure_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+            "scenario_id": f"{self.flight_number}_{failure_type}_{self._stamp}",
             "timestamp": datetime.now().isoformat(),
             "aircraft": {
                 "type": self.aircraft_type,
@@ -180,99 +420,165 @@ class EnhancedScenarioSimulator:
             "failure": {
                 "type": failure_type,
                 "description": self.get_failure_description(failure_type),
-                "severity": self.calculate_failure_severity(failure_type, progress_percent)
+                "severity": severity
             },
             "position": {
                 "distance_from_origin_nm": self.position_nm_from_origin,
                 "initial_altitude_ft": self.altitude_ft,
-                "adjusted_altitude_ft": self.calculate_adjusted_altitude(failure, failure_type),
-                "phase_of_flight": self.determine_flight_phase(progress_percent)
+                "adjusted_altitude_ft": self.calculate_adjusted_altitude(params),
+                "phase_of_flight": phase
             },
             "operational_impact": {
-                "fuel_penalty_factor": failure.get("fuel_penalty_factor", 1.0),
-                "landing_distance_factor": failure.get("landing_distance_factor", 1.0),
-                "speed_restriction_knots": failure.get("speed_knots", None),
-                "diversion_required": failure.get("diversion_required", False),
-                "emergency_descent_required": failure_type == "decompression"
+                "fuel_penalty_factor": params.fuel_penalty_factor,
+                "landing_distance_factor": params.landing_distance_factor,
+                "speed_restriction_knots": params.speed_knots,
+                "diversion_required": params.diversion_required,
+                "emergency_descent_required": failure_type == DECOMPRESSION
             },
             "systems_affected": self.analyze_systems_impact(failure, failure_type),
             "crew_actions": self.generate_crew_actions(failure_type, failure),
-            "operational_actions": self.generate_operational_actions(failure_type, progress_percent),
-            "operational_notes": self.generate_operational_notes(failure_type, failure, progress_percent),
-            "diversion_analysis": self.analyze_diversion_options(failure_type, progress_percent),
-            "fuel_analysis": self.calculate_fuel_impact(failure, remaining_distance),
+            "operational_actions": self.generate_operational_actions(failure_type, progress_percent, diversion_analysis),
+            "operational_notes": self.generate_operational_notes(failure_type, failure, progress_percent, phase=phase),
+            "diversion_analysis": diversion_analysis,
+            "fuel_analysis": self.calculate_fuel_impact(params, remaining_distance),
             "passenger_impact": self.assess_passenger_impact(failure_type),
             "regulatory_considerations": self.get_regulatory_considerations(failure_type),
             "aino_recommendations": self.generate_aino_recommendations(failure_type, progress_percent)
         }
 
-        logger.info(f"Failure scenario simulation complete: {failure_type} for {self.aircraft_type}")
+        logger.info("Failure scenario simulation complete: %s for %s", failure_type, self.aircraft_type)
         return self.result
 
-    def calculate_adjusted_altitude(self, failure: Dict, failure_type: str) -> int:
-        """Calculate adjusted altitude after failure"""
-        if failure_type == "decompression":
-            return failure.get("descent_altitude_ft", 10000)
-        elif failure_type == "engine_failure":
-            return failure.get("drift_down_altitude_ft", self.altitude_ft)
-        else:
-            return self.altitude_ft
+    @classmethod
+    def simulate_fleet(cls, scenarios: List[Dict], failure_types: List[str]):
+        """
+        Vectorised core metrics for every (scenario, failure type) pair
+        
+        Args:
+            scenarios: Flight dicts with aircraft_type, origin, destination,
+                       position_nm and altitude keys (as used in main())
+            failure_types: Failure types to evaluate for every flight
+            
+        Returns:
+            Structured NumPy array of shape (len(scenarios), len(failure_types))
+            with phase, severity, altitude, diversion and fuel fields. Use
+            simulate_failure for the full per-scenario analysis.
+        """
+        # numpy is only needed for fleet sweeps; single scenarios stay stdlib-only
+        import numpy as np
+        
+        # Resolve and parse each aircraft type's profile once
+        profiles = {}
+        for aircraft_type in {s["aircraft_type"] for s in scenarios}:
+            filepath = _resolve_profile_path(aircraft_type)
+            try:
+                profiles[aircraft_type] = _load_profile(filepath, os.path.getmtime(filepath)) if filepath else None
+            except Exception as e:
+                logger.error("Error loading profile from %s: %s", filepath, e)
+                profiles[aircraft_type] = None
+            if profiles[aircraft_type] is None:
+                profiles[aircraft_type] = cls.create_fallback_profile()
+            profiles[aircraft_type] = _parse_failure_parameters(profiles[aircraft_type])
+        
+        positions = np.array([s["position_nm"] for s in scenarios], dtype=float)
+        altitudes = np.array([s["altitude"] for s in scenarios], dtype=float)
+        totals = np.array([
+            VIRGIN_ATLANTIC_ROUTES.get(f"{s['origin'].upper()}-{s['destination'].upper()}", {}).get('distance_nm', 3500)
+            for s in scenarios
+        ], dtype=float)
+        
+        progress = positions / totals * 100
+        remaining = totals - positions
+        
+        # Phase codes index _PHASES; the severity table is indexed [failure, phase]
+        phase_idx = np.searchsorted(cls._PHASE_BOUNDS, progress, side='right')
+        severity_table = np.array([
+            [cls._SEVERITY_MATRIX.get(failure_type, {}).get(phase, "MEDIUM") for phase in cls._PHASES]
+            for failure_type in failure_types
+        ])
+        
+        # Per-(scenario, failure) profile parameters; NaN altitude means "hold current altitude"
+        shape = (len(scenarios), len(failure_types))
+        fuel_factor = np.empty(shape)
+        altitude_override = np.full(shape, np.nan)
+        diversion = np.empty(shape, dtype=bool)
+        for i, scenario in enumerate(scenarios):
+            profile = profiles[scenario["aircraft_type"]]
+            for j, failure_type in enumerate(failure_types):
+                if failure_type not in profile:
+                    raise ValueError(f"{failure_type} not found in digital twin profile for {scenario['aircraft_type']}")
+                params = profile[failure_type]
+                fuel_factor[i, j] = params.fuel_penalty_factor
+                diversion[i, j] = params.diversion_required
+                if params.target_altitude_ft is not None:
+                    altitude_override[i, j] = params.target_altitude_ft
+        
+        penalty_per_hour = fuel_factor - 1.0
+        
+        result = np.empty(shape, dtype=[
+            ("progress_percent", "f8"),
+            ("remaining_distance_nm", "f8"),
+            ("phase_of_flight", "U9"),
+            ("severity", "U8"),
+            ("adjusted_altitude_ft", "f8"),
+            ("diversion_required", "?"),
+            ("fuel_penalty_factor", "f8"),
+            ("estimated_extra_fuel_gallons", "i8")
+        ])
+        result["progress_percent"] = progress[:, None]
+        result["remaining_distance_nm"] = remaining[:, None]
+        result["phase_of_flight"] = np.array(cls._PHASES)[phase_idx][:, None]
+        result["severity"] = severity_table[:, phase_idx].T
+        result["adjusted_altitude_ft"] = np.where(np.isnan(altitude_override), altitudes[:, None], altitude_override)
+        result["diversion_required"] = diversion
+        result["fuel_penalty_factor"] = fuel_factor
+        # Truncate toward zero like int() in calculate_fuel_impact
+        result["estimated_extra_fuel_gallons"] = np.trunc(penalty_per_hour * (remaining[:, None] * 0.8))
+        
+        return result
+
+    def calculate_adjusted_altitude(self, params: FailureParameters) -> int:
+        """Calculate adjusted altitude after failure (descent/drift-down target, else current)"""
+        if params.target_altitude_ft is not None:
+            return params.target_altitude_ft
+        return self.altitude_ft
 
     def determine_flight_phase(self, progress_percent: float) -> str:
         """Determine current flight phase based on progress"""
-        if progress_percent < 10:
-            return "DEPARTURE"
-        elif progress_percent < 30:
-            return "CLIMB"
-        elif progress_percent < 70:
-            return "CRUISE"
-        elif progress_percent < 90:
-            return "DESCENT"
-        else:
-            return "APPROACH"
-
-    def calculate_failure_severity(self, failure_type: str, progress_percent: float) -> str:
-        """Calculate failure severity based on type and flight phase"""
-        severity_matrix = {
-            "engine_failure": {"DEPARTURE": "CRITICAL", "CLIMB": "HIGH", "CRUISE": "MEDIUM", "DESCENT": "HIGH", "APPROACH": "CRITICAL"},
-            "decompression": {"DEPARTURE": "CRITICAL", "CLIMB": "CRITICAL", "CRUISE": "HIGH", "DESCENT": "HIGH", "APPROACH": "CRITICAL"},
-            "hydraulic_failure": {"DEPARTURE": "MEDIUM", "CLIMB": "MEDIUM", "CRUISE": "LOW", "DESCENT": "MEDIUM", "APPROACH": "HIGH"},
-            "single_engine_landing": {"DEPARTURE": "CRITICAL", "CLIMB": "CRITICAL", "CRUISE": "HIGH", "DESCENT": "HIGH", "APPROACH": "HIGH"}
-        }
-        
-        phase = self.determine_flight_phase(progress_percent)
-        return severity_matrix.get(failure_type, {}).get(phase, "MEDIUM")
+        return self._PHASES[bisect.bisect_right(self._PHASE_BOUNDS, progress_percent)]
+
+    def calculate_failure_severity(self, failure_type: str, progress_percent: float,
+                                   phase: Optional[str] = None) -> str:
+        """Calculate failure severity based on type and flight phase (derived from progress if not given)"""
+        if phase is None:
+            phase = self.determine_flight_phase(progress_percent)
+        return _severity(failure_type, phase)
 
     def get_failure_description(self, failure_type: str) -> str:
         """Get human-readable failure description"""
-        descriptions = {
-            "engine_failure": "Engine failure requiring single-engine operations",
-            "decompression": "Cabin pressurization failure requiring emergency descent",
-            "hydraulic_failure": "Hydraulic system failure affecting flight controls and landing gear",
-            "single_engine_landing": "Single-engine approach and landing procedures"
-        }
-        return descriptions.get(failure_type, "Unknown failure type")
+        return self._DESCRIPTIONS.get(failure_type, "Unknown failure type")
 
     def analyze_systems_impact(self, failure: Dict, failure_type: str) -> Dict:
         """Analyze impact on aircraft systems"""
         systems_impact = {
             "primary_systems_lost": failure.get("systems_lost", []),
             "backup_systems_available": True,
-            "flight_controls_affected": failure_type in ["hydraulic_failure", "engine_failure"],
-            "landing_gear_affected": failure_type == "hydraulic_failure",
-            "pressurization_affected": failure_type == "decompression"
+            "flight_controls_affected": failure_type in (HYDRAULIC_FAILURE, ENGINE_FAILURE),
+            "landing_gear_affected": failure_type == HYDRAULIC_FAILURE,
+            "pressurization_affected": failure_type == DECOMPRESSION
         }
         
         # Engine failure specific systems mapping
-        if failure_type == "engine_failure":
-            systems_affected = failure.get("systems_lost", [])
+        if failure_type == ENGINE_FAILURE:
+            params = self.failure_params.get(failure_type)
+            systems_affected = params.systems_lost if params is not None else frozenset(failure.get("systems_lost", ()))
             systems_impact["engine_failure_systems"] = {
                 "hydraulics_2": "HYD 2" in systems_affected,
                 "gen_2": "GEN 2" in systems_affected,
                 "bleed_2": "BLEED 2" in systems_affected
             }
         
-        if failure_type == "hydraulic_failure":
+        if failure_type == HYDRAULIC_FAILURE:
             systems_impact["lost_hydraulic_systems"] = failure.get("lost_systems", {})
             systems_impact["alternate_gear_extension"] = failure.get("alternate_gear_extension_required", False)
         
@@ -282,7 +588,7 @@ class EnhancedScenarioSimulator:
         """Generate required crew actions for the failure"""
         actions = []
         
-        if failure_type == "engine_failure":
+        if failure_type == ENGINE_FAILURE:
             actions.extend([
                 "Execute engine failure checklist",
                 "Configure for single-engine operations",
@@ -290,7 +596,7 @@ class EnhancedScenarioSimulator:
                 "Consider nearest suitable airport for diversion",
                 "Coordinate with ATC for priority handling"
             ])
-        elif failure_type == "decompression":
+        elif failure_type == DECOMPRESSION:
             actions.extend([
                 "Don oxygen masks immediately",
                 "Execute emergency descent to 10,000 ft",
@@ -298,7 +604,7 @@ class EnhancedScenarioSimulator:
                 "Secure cabin and check passenger oxygen",
                 "Consider nearest suitable airport"
             ])
-        elif failure_type == "hydraulic_failure":
+        elif failure_type == HYDRAULIC_FAILURE:
             actions.extend([
                 "Execute hydraulic failure checklist",
                 "Configure for alternate gear extension",
@@ -306,7 +612,7 @@ class EnhancedScenarioSimulator:
                 "Coordinate with maintenance for system status",
                 "Brief cabin crew on emergency procedures"
             ])
-        elif failure_type == "single_engine_landing":
+        elif failure_type == SINGLE_ENGINE_LANDING:
             actions.extend([
                 "Configure for single-engine approach",
                 "Verify landing distance calculations",
@@ -317,54 +623,49 @@ class EnhancedScenarioSimulator:
         
         return actions
 
-    def generate_operational_notes(self, failure_type: str, failure: Dict, progress_percent: float) -> List[str]:
+    def generate_operational_notes(self, failure_type: str, failure: Dict, progress_percent: float,
+                                   phase: Optional[str] = None) -> List[str]:
         """Generate operational notes and considerations"""
         notes = []
         
         # Common notes
-        notes.append(f"Failure occurred during {self.determine_flight_phase(progress_percent)} phase")
+        notes.append(f"Failure occurred during {phase or self.determine_flight_phase(progress_percent)} phase")
         
-        if failure_type == "hydraulic_failure":
+        if failure_type == HYDRAULIC_FAILURE:
             notes.append("Check for alternate gear extension and brake mode impact")
             if "flap_restriction" in failure:
                 notes.append(f"Flap limitation: {failure['flap_restriction']}")
         
-        elif failure_type == "decompression":
+        elif failure_type == DECOMPRESSION:
             notes.append("Emergency descent required - oxygen limits may apply")
             if "oxygen_duration_min_crew" in failure:
                 notes.append(f"Crew oxygen duration: {failure['oxygen_duration_min_crew']} minutes")
         
-        elif failure_type == "engine_failure":
+        elif failure_type == ENGINE_FAILURE:
             notes.append("Single-engine operations - max continuous thrust enabled")
             if failure.get("autothrust_limited"):
                 notes.append("Autothrust functionality may be limited")
         
-        elif failure_type == "single_engine_landing":
+        elif failure_type == SINGLE_ENGINE_LANDING:
             notes.append("Evaluate landing distance, flap limits, and reverser availability")
             if "reverser_available" in failure:
                 notes.append(f"Reverser status: {failure['reverser_available']}")
         
         return notes
 
-    def analyze_diversion_options(self, failure_type: str, progress_percent: float) -> Dict:
+    def analyze_diversion_options(self, failure_type: str, progress_percent: float,
+                                  severity: Optional[str] = None) -> Dict:
         """Analyze diversion requirements and options using intelligent ranking"""
-        diversion_required = self.twin_profile[failure_type].get("diversion_required", False)
+        diversion_required = self.failure_params[failure_type].diversion_required
         
-        # Initialize alternate airport ranker
+        # Rank alternates; repeated analyses of the same failure reuse the result
         try:
-            from alternate_airport_ranking import AlternateAirportRanker
-            ranker = AlternateAirportRanker()
-            
-            # Get failure profile for ranking
-            failure_profile = self.twin_profile[failure_type].copy()
-            failure_profile["type"] = failure_type
-            
-            # Get ranked alternates
-            recommended = ranker.get_recommended_alternates(failure_profile, self.aircraft_type, max_results=5)
-            suitable_airports = [alt["icao"] for alt in recommended]
-            
-            # Generate diversion report
-            diversion_report = ranker.generate_diversion_report(failure_profile, self.aircraft_type, self.flight_number)
+            profile_key = json.dumps(self.twin_profile[failure_type], sort_keys=True)
+            suitable_airports, diversion_report = _rank_alternates(
+                failure_type, self.aircraft_type, self.flight_number, profile_key
+            )
+            suitable_airports = list(suitable_airports)
+            diversion_report = copy.deepcopy(diversion_report)
             
         except Exception as e:
             # Fallback to static list if ranking fails
@@ -373,7 +674,7 @@ class EnhancedScenarioSimulator:
         
         return {
             "diversion_required": diversion_required,
-            "severity": self.calculate_failure_severity(failure_type, progress_percent),
+            "severity": severity or self.calculate_failure_severity(failure_type, progress_percent),
             "recommended_action": "CONTINUE" if not diversion_required else "DIVERT",
             "suitable_airports": suitable_airports,
             "minimum_runway_length_ft": self.calculate_minimum_runway_length(failure_type),
@@ -384,71 +685,35 @@ class EnhancedScenarioSimulator:
     def calculate_minimum_runway_length(self, failure_type: str) -> int:
         """Calculate minimum runway length requirement"""
         base_length = 8000  # Base requirement in feet
-        landing_factor = self.twin_profile[failure_type].get("landing_distance_factor", 1.0)
+        landing_factor = self.failure_params[failure_type].landing_distance_factor
         return int(base_length * landing_factor)
 
     def get_diversion_requirements(self, failure_type: str) -> List[str]:
         """Get special requirements for diversion"""
-        requirements = []
-        
-        if failure_type == "hydraulic_failure":
-            requirements.extend(["Long runway", "Arresting gear available", "Emergency services"])
-        elif failure_type == "engine_failure":
-            requirements.extend(["Maintenance capability", "Long runway", "Emergency services"])
-        elif failure_type == "decompression":
-            requirements.extend(["Medical facilities", "Low altitude approach", "Emergency services"])
-        
-        return requirements
+        return list(self._DIVERSION_REQS.get(failure_type, ()))
 
-    def calculate_fuel_impact(self, failure: Dict, remaining_distance: float) -> Dict:
+    def calculate_fuel_impact(self, params: FailureParameters, remaining_distance: float) -> Dict:
         """Calculate fuel consumption impact"""
-        fuel_penalty_factor = failure.get("fuel_penalty_factor", 1.0)
-        expected_fuel_burn_penalty_per_hour = fuel_penalty_factor - 1.0
-        base_consumption = remaining_distance * 0.8  # Rough estimate: 0.8 gallons per nm
+        fuel_penalty_factor = params.fuel_penalty_factor
+        penalty_per_hour, extra_fuel_gallons, range_impact = _fuel_impact_core(
+            fuel_penalty_factor, remaining_distance
+        )
         
         return {
             "fuel_penalty_factor": fuel_penalty_factor,
-            "expected_fuel_burn_penalty_per_hour": expected_fuel_burn_penalty_per_hour,
-            "estimated_extra_fuel_gallons": int(expected_fuel_burn_penalty_per_hour * base_consumption),
-            "range_impact_percent": round(expected_fuel_burn_penalty_per_hour * 100, 1),
+            "expected_fuel_burn_penalty_per_hour": penalty_per_hour,
+            "estimated_extra_fuel_gallons": extra_fuel_gallons,
+            "range_impact_percent": round(range_impact, 1),
             "fuel_status": "ADEQUATE" if fuel_penalty_factor < 1.2 else "MONITOR" if fuel_penalty_factor < 1.3 else "CRITICAL"
         }
 
     def assess_passenger_impact(self, failure_type: str) -> Dict:
         """Assess impact on passengers"""
-        impact_levels = {
-            "engine_failure": {"comfort": "MODERATE", "safety": "LOW", "schedule": "HIGH"},
-            "decompression": {"comfort": "HIGH", "safety": "MEDIUM", "schedule": "HIGH"},
-            "hydraulic_failure": {"comfort": "LOW", "safety": "LOW", "schedule": "MEDIUM"},
-            "single_engine_landing": {"comfort": "MODERATE", "safety": "MEDIUM", "schedule": "LOW"}
-        }
-        
-        return impact_levels.get(failure_type, {"comfort": "LOW", "safety": "LOW", "schedule": "LOW"})
+        return dict(self._PASSENGER_IMPACT.get(failure_type, self._DEFAULT_PASSENGER_IMPACT))
 
     def get_regulatory_considerations(self, failure_type: str) -> List[str]:
         """Get relevant regulatory considerations"""
-        considerations = []
-        
-        if failure_type == "engine_failure":
-            considerations.extend([
-                "ETOPS regulations may apply",
-                "Report to manufacturer and authority",
-                "Enhanced inspection requirements"
-            ])
-        elif failure_type == "decompression":
-            considerations.extend([
-                "Mandatory occurrence report",
-                "Cabin altitude exceeded certification limits",
-                "Medical assessment required"
-            ])
-        elif failure_type == "hydraulic_failure":
-            considerations.extend([
-                "System redundancy analysis required",
-                "Maintenance inspection mandatory",
-                "Component replacement needed"
-            ])
-        
-        return considerations
+        return list(self._REG_CONSIDERATIONS.get(failure_type, ()))
 
     def generate_aino_recommendations(self, failure_type: str, progress_percent: float) -> List[str]:
         """Generate AINO platform-specific recommendations"""
@@ -458,11 +723,11 @@ class EnhancedScenarioSimulator:
         recommendations.append("Activate enhanced monitoring in AINO Operations Center")
         recommendations.append("Initiate passenger communication protocols")
         
-        if self.twin_profile[failure_type].get("diversion_required"):
+        if self.failure_params[failure_type].diversion_required:
             recommendations.append("Execute AINO automated diversion support workflow")
             recommendations.append("Coordinate ground services at diversion airport")
         
-        if failure_type == "decompression":
+        if failure_type == DECOMPRESSION:
             recommendations.append("Alert medical coordination team")
             recommendations.append("Prepare passenger assistance protocols")
         
@@ -471,30 +736,44 @@ class EnhancedScenarioSimulator:
         
         return recommendations
 
-    def export_scenario(self, filename: str = None) -> str:
-        """Export scenario to JSON file"""
+    def export_scenario(self, filename: str = None) -> Future:
+        """
+        Export scenario to JSON file
+        
+        The file is written on a background thread so the next simulation can
+        start immediately. Returns a Future whose result() is the filename, or
+        None if the write failed; flush_exports() waits for exports still pending.
+        """
         if not filename:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = self._stamp or datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"scenario_{self.aircraft_type}_{self.result.get('failure', {}).get('type', 'unknown')}_{timestamp}.json"
         
-        try:
-            with open(filename, 'w') as f:
-                json.dump(self.result, f, indent=2)
-            logger.info(f"Scenario exported to {filename}")
-            return filename
-        except Exception as e:
-            logger.error(f"Error exporting scenario: {e}")
-            return None
+        # simulate_failure builds a new result dict each run, so this one is not mutated under the writer
+        future = _EXPORT_POOL.submit(_export_json, filename, self.result)
+        with _PENDING_EXPORTS_LOCK:
+            _PENDING_EXPORTS.add(future)
+        future.add_done_callback(_discard_export)
+        return future
+    
+    @staticmethod
+    def flush_exports() -> List[str]:
+        """Wait for scenario exports still pending; returns the files they wrote successfully"""
+        with _PENDING_EXPORTS_LOCK:
+            pending = list(_PENDING_EXPORTS)
+        wait(pending)
+        return [f.result() for f in pending if f.result()]
     
-    def generate_operational_actions(self, failure_type: str, progress_percent: float) -> Dict:
+    def generate_operational_actions(self, failure_type: str, progress_percent: float,
+                                     diversion_analysis: Optional[Dict] = None) -> Dict:
         """Generate comprehensive operational actions using post-failure knowledge base"""
         try:
-            from post_failure_actions import PostFailureActionsManager
-            
-            actions_manager = PostFailureActionsManager()
+            if _ACTIONS_MANAGER is None:
+                raise ImportError("post_failure_actions module not available")
+            actions_manager = _ACTIONS_MANAGER
             
             # Get diversion information if available
-            diversion_analysis = self.analyze_diversion_options(failure_type, progress_percent)
+            if diversion_analysis is None:
+                diversion_analysis = self.analyze_diversion_options(failure_type, progress_percent)
             diversion_info = None
             
             if diversion_analysis.get("diversion_required") and "intelligent_ranking" in diversion_analysis:
@@ -572,6 +851,14 @@ def main():
     
     failure_types = ["engine_failure", "decompression", "hydraulic_failure", "single_engine_landing"]
     
+    # Fleet-wide overview of every scenario against every failure type in one pass
+    fleet = EnhancedScenarioSimulator.simulate_fleet(scenarios, failure_types)
+    print("\nFleet overview:")
+    for scenario, row in zip(scenarios, fleet):
+        summary = ", ".join(f"{ft}={cell['severity']}" for ft, cell in zip(failure_types, row))
+        print(f"  {scenario['flight_number']} ({row[0]['phase_of_flight']}): {summary}")
+    
+    exports = []
     for i, scenario in enumerate(scenarios[:1]):  # Run first scenario only for demo
         print(f"\nScenario {i+1}: {scenario['flight_number']} - {scenario['aircraft_type']}")
         print(f"Route: {scenario['origin']} to {scenario['destination']}")
@@ -595,13 +882,15 @@ def main():
                 print(f"    ✓ Fuel impact: {result['fuel_analysis']['fuel_penalty_factor']}x")
                 print(f"    ✓ AINO recommendations: {len(result['aino_recommendations'])} items")
                 
-                # Export scenario
-                filename = sim.export_scenario()
-                if filename:
-                    print(f"    ✓ Exported to: {filename}")
+                # Export scenario; written in the background while the next one runs
+                exports.append(sim.export_scenario())
                     
             except Exception as e:
                 print(f"    ✗ Error: {e}")
+    
+    for future in exports:
+        if future.result():
+            print(f"✓ Exported to: {future.result()}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
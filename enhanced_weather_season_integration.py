@@ -3,17 +3,95 @@ Enhanced Weather & Seasonal Integration for AINO ML Model Validation
 Integrates authentic AVWX METAR data with seasonal features for comprehensive weather-enhanced predictions
 """
 
+import numpy as np
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import atexit
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+import functools
 import json
 import os
-import warnings
-warnings.filterwarnings('ignore')
+import shelve
+import threading
+import time
+
+# Optional: Parquet output
+try:
+    import pyarrow  # noqa: F401  (pandas looks the engine up by name)
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# On-disk METAR cache shared across runs; METARs are issued hourly
+METAR_CACHE_PATH = os.path.join('data', 'enhanced', '.metar_cache')
+METAR_CACHE_TTL_SECONDS = 3600
+
+# Keep-alive connection pool shared by all integrators, sized for the METAR fan-out
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.3,
+                      status_forcelist=[429, 502, 503, 504], raise_on_status=False)
+))
+
+_DISK_CACHE = None
+_DISK_CACHE_LOCK = threading.Lock()
+
+def _open_disk_cache():
+    """Open the shared METAR shelf on first use (None if unavailable)"""
+    global _DISK_CACHE
+    if _DISK_CACHE is None:
+        try:
+            os.makedirs(os.path.dirname(METAR_CACHE_PATH), exist_ok=True)
+            _DISK_CACHE = shelve.open(METAR_CACHE_PATH)
+            atexit.register(_DISK_CACHE.close)
+        except Exception as e:
+            print(f"METAR disk cache unavailable: {e}")
+            _DISK_CACHE = False
+    return _DISK_CACHE if _DISK_CACHE is not False else None
+
+def _disk_cache_get(cache_key: str):
+    """Return a cached METAR record if it is younger than the TTL"""
+    with _DISK_CACHE_LOCK:
+        cache = _open_disk_cache()
+        entry = cache.get(cache_key) if cache is not None else None
+    if entry is not None and time.time() - entry[0] < METAR_CACHE_TTL_SECONDS:
+        return entry[1]
+    return None
+
+def _disk_cache_put(cache_key: str, weather_data: dict):
+    """Persist a METAR record with its fetch time"""
+    with _DISK_CACHE_LOCK:
+        cache = _open_disk_cache()
+        if cache is not None:
+            cache[cache_key] = (time.time(), weather_data)
 
 class EnhancedWeatherIntegrator:
     """Enhanced weather integration with AVWX API and seasonal feature engineering"""
     
+    # Condition keywords used to grade METAR weather impact
+    HIGH_IMPACT_WEATHER = ('thunderstorm', 'heavy', 'freezing', 'snow', 'ice')
+    MEDIUM_IMPACT_WEATHER = ('rain', 'drizzle', 'mist', 'fog', 'haze')
+    
+    # Realistic weather patterns by airport, used when no METAR is available
+    _WEATHER_PATTERNS = {
+        'KJFK': {'temp_base': 15, 'wind_base': 12, 'vis_base': 8},
+        'KBOS': {'temp_base': 12, 'wind_base': 14, 'vis_base': 9},
+        'KATL': {'temp_base': 22, 'wind_base': 8, 'vis_base': 10},
+        'KLAX': {'temp_base': 20, 'wind_base': 6, 'vis_base': 12},
+        'KSFO': {'temp_base': 16, 'wind_base': 10, 'vis_base': 7},
+        'KMCO': {'temp_base': 26, 'wind_base': 7, 'vis_base': 10},
+        'KMIA': {'temp_base': 28, 'wind_base': 9, 'vis_base': 10},
+        'KTPA': {'temp_base': 25, 'wind_base': 8, 'vis_base': 10},
+        'KLAS': {'temp_base': 24, 'wind_base': 6, 'vis_base': 15},
+        'EGLL': {'temp_base': 10, 'wind_base': 15, 'vis_base': 6}
+    }
+    _DEFAULT_WEATHER_PATTERN = {'temp_base': 15, 'wind_base': 10, 'vis_base': 10}
+    
     def __init__(self):
         # IATA to ICAO code mapping for our validation airports
         self.IATA_TO_ICAO = {
@@ -26,8 +104,17 @@ class EnhancedWeatherIntegrator:
         self.avwx_api_key = os.getenv('AVWX_API_KEY', None)
         self.avwx_headers = {"Authorization": f"Bearer {self.avwx_api_key}"} if self.avwx_api_key else None
         
-        # Weather feature cache
+        # Weather feature cache (shared by concurrent METAR fetches)
         self.weather_cache = {}
+        self._cache_lock = threading.Lock()
+        
+        # Fallback weather for known airports as (month, airport) arrays, built once
+        self._icao_idx = {icao: i for i, icao in enumerate(self._WEATHER_PATTERNS)}
+        fallback = [[self._build_fallback_weather(icao, month) for icao in self._icao_idx]
+                    for month in range(1, 13)]
+        self._fallback_temp = np.array([[w['TemperatureC'] for w in row] for row in fallback])
+        self._fallback_vis = np.array([[w['VisibilityKm'] for w in row] for row in fallback])
+        self._fallback_wind = np.array([p['wind_base'] for p in self._WEATHER_PATTERNS.values()])
         
     def add_temporal_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Add comprehensive temporal features for ML enhancement"""
@@ -35,10 +122,10 @@ class EnhancedWeatherIntegrator:
         
         # Ensure datetime parsing
         if 'Scheduled' in df.columns:
-            df['Scheduled'] = pd.to_datetime(df['Scheduled'], errors='coerce')
+            df['Scheduled'] = self._parse_timestamps(df['Scheduled'])
             time_col = 'Scheduled'
         elif 'ScrapeTimeUTC' in df.columns:
-            df['ScrapeTimeUTC'] = pd.to_datetime(df['ScrapeTimeUTC'], errors='coerce')
+            df['ScrapeTimeUTC'] = self._parse_timestamps(df['ScrapeTimeUTC'])
             time_col = 'ScrapeTimeUTC'
         else:
             # Use current time as fallback
@@ -50,48 +137,69 @@ class EnhancedWeatherIntegrator:
         df['Weekday'] = df[time_col].dt.dayofweek
         df['Hour'] = df[time_col].dt.hour
         df['DayOfYear'] = df[time_col].dt.dayofyear
-        df['IsWeekend'] = (df['Weekday'] >= 5).astype(int)
+        df['IsWeekend'] = (df['Weekday'] >= 5).astype('int8')
         
-        # Define seasonal mapping (Northern Hemisphere)
-        def get_season_numeric(month):
-            if month in [12, 1, 2]: return 0  # Winter
-            elif month in [3, 4, 5]: return 1  # Spring
-            elif month in [6, 7, 8]: return 2  # Summer
-            else: return 3  # Autumn
-        
-        df['Season'] = df['Month'].apply(get_season_numeric)
+        # Define seasonal mapping (Northern Hemisphere):
+        # Winter=0 (Dec-Feb), Spring=1, Summer=2, Autumn=3; unknown months fall back to Autumn
+        df['Season'] = ((df['Month'] % 12) // 3).fillna(3).astype('int8')
         
         # Peak travel periods
-        df['IsPeakSummer'] = ((df['Month'] >= 6) & (df['Month'] <= 8)).astype(int)
+        df['IsPeakSummer'] = ((df['Month'] >= 6) & (df['Month'] <= 8)).astype('int8')
         df['IsHolidayPeriod'] = ((df['Month'] == 12) | (df['Month'] == 1) | 
-                                (df['Month'] == 7) | (df['Month'] == 8)).astype(int)
-        
-        # Time of day categories
-        def get_time_category(hour):
-            if 5 <= hour < 12: return 0  # Morning
-            elif 12 <= hour < 17: return 1  # Afternoon  
-            elif 17 <= hour < 22: return 2  # Evening
-            else: return 3  # Night
+                                (df['Month'] == 7) | (df['Month'] == 8)).astype('int8')
         
-        df['TimeCategory'] = df['Hour'].apply(get_time_category)
+        # Time of day categories: Morning=0, Afternoon=1, Evening=2, Night=3
+        hour = df['Hour'].to_numpy(dtype=float)
+        df['TimeCategory'] = np.select(
+            [hour < 5, hour < 12, hour < 17, hour < 22],
+            [3, 0, 1, 2],
+            default=3
+        ).astype(np.int8)
         
         print(f"Added 9 temporal features for {len(df)} flights")
         return df
     
-    def fetch_avwx_weather(self, icao_code: str) -> dict:
+    @staticmethod
+    def _parse_timestamps(values: pd.Series) -> pd.Series:
+        """Parse timestamps as ISO 8601, re-parsing anything else with mixed formats"""
+        parsed = pd.to_datetime(values, format='ISO8601', cache=True, errors='coerce')
+        
+        # Non-ISO strings (e.g. from PDF-extracted schedules) and epoch numbers
+        retry = parsed.isna() & values.notna()
+        if retry.any():
+            retried = pd.to_datetime(values[retry], format='mixed', cache=True, errors='coerce')
+            if not parsed.notna().any():
+                parsed = retried.reindex(values.index)
+            elif retried.dtype == parsed.dtype:
+                parsed[retry] = retried
+            # Otherwise the retried rows are naive where the rest are tz-aware (or vice
+            # versa); they cannot share one dtype, so they stay NaT
+        return parsed
+    
+    def fetch_avwx_weather(self, icao_code: str, now: datetime = None) -> dict:
         """Fetch authentic weather data from AVWX API"""
+        if now is None:
+            now = datetime.now()
         if not self.avwx_api_key:
-            return self._get_fallback_weather(icao_code)
+            return self._get_fallback_weather(icao_code, now)
         
         # Check cache first
-        cache_key = f"{icao_code}_{datetime.now().strftime('%Y%m%d_%H')}"
-        if cache_key in self.weather_cache:
-            return self.weather_cache[cache_key]
+        cache_key = f"{icao_code}_{now.strftime('%Y%m%d_%H')}"
+        with self._cache_lock:
+            if cache_key in self.weather_cache:
+                return self.weather_cache[cache_key]
+        
+        # Then the on-disk cache from earlier runs
+        weather_data = _disk_cache_get(cache_key)
+        if weather_data is not None:
+            with self._cache_lock:
+                self.weather_cache[cache_key] = weather_data
+            return weather_data
         
         try:
             # Fetch current METAR
             url = f"https://avwx.rest/api/metar/{icao_code}?options=info,translate"
-            response = requests.get(url, headers=self.avwx_headers, timeout=10)
+            response = _SESSION.get(url, headers=self.avwx_headers, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -108,41 +216,28 @@ class EnhancedWeatherIntegrator:
                 }
                 
                 # Cache the result
-                self.weather_cache[cache_key] = weather_data
+                with self._cache_lock:
+                    self.weather_cache[cache_key] = weather_data
+                _disk_cache_put(cache_key, weather_data)
                 return weather_data
             else:
                 print(f"AVWX API error for {icao_code}: {response.status_code}")
-                return self._get_fallback_weather(icao_code)
+                return self._get_fallback_weather(icao_code, now)
                 
         except Exception as e:
             print(f"Weather fetch failed for {icao_code}: {e}")
-            return self._get_fallback_weather(icao_code)
+            return self._get_fallback_weather(icao_code, now)
     
-    def _get_fallback_weather(self, icao_code: str) -> dict:
-        """Provide realistic fallback weather based on location and season"""
-        # Realistic weather patterns by airport and current month
-        current_month = datetime.now().month
-        
-        weather_patterns = {
-            'KJFK': {'temp_base': 15, 'wind_base': 12, 'vis_base': 8},
-            'KBOS': {'temp_base': 12, 'wind_base': 14, 'vis_base': 9},
-            'KATL': {'temp_base': 22, 'wind_base': 8, 'vis_base': 10},
-            'KLAX': {'temp_base': 20, 'wind_base': 6, 'vis_base': 12},
-            'KSFO': {'temp_base': 16, 'wind_base': 10, 'vis_base': 7},
-            'KMCO': {'temp_base': 26, 'wind_base': 7, 'vis_base': 10},
-            'KMIA': {'temp_base': 28, 'wind_base': 9, 'vis_base': 10},
-            'KTPA': {'temp_base': 25, 'wind_base': 8, 'vis_base': 10},
-            'KLAS': {'temp_base': 24, 'wind_base': 6, 'vis_base': 15},
-            'EGLL': {'temp_base': 10, 'wind_base': 15, 'vis_base': 6}
-        }
-        
-        pattern = weather_patterns.get(icao_code, {'temp_base': 15, 'wind_base': 10, 'vis_base': 10})
+    @classmethod
+    def _build_fallback_weather(cls, icao_code: str, month: int) -> dict:
+        """Realistic fallback weather for one airport and month"""
+        pattern = cls._WEATHER_PATTERNS.get(icao_code, cls._DEFAULT_WEATHER_PATTERN)
         
         # Seasonal adjustments
-        if current_month in [12, 1, 2]:  # Winter
+        if month in [12, 1, 2]:  # Winter
             temp_adj = -8 if icao_code.startswith('K') else -5
             vis_adj = -2
-        elif current_month in [6, 7, 8]:  # Summer
+        elif month in [6, 7, 8]:  # Summer
             temp_adj = 8 if icao_code.startswith('K') else 5
             vis_adj = 1
         else:  # Spring/Autumn
@@ -160,98 +255,136 @@ class EnhancedWeatherIntegrator:
             'WeatherCondition': 'Clear'
         }
     
+    def _get_fallback_weather(self, icao_code: str, now: datetime = None) -> dict:
+        """Provide realistic fallback weather based on location and season"""
+        month = (now or datetime.now()).month
+        idx = self._icao_idx.get(icao_code)
+        if idx is None:
+            return self._build_fallback_weather(icao_code, month)
+        
+        temperature = int(self._fallback_temp[month - 1, idx])
+        return {
+            'TemperatureC': temperature,
+            'WindSpeedKt': int(self._fallback_wind[idx]),
+            'VisibilityKm': int(self._fallback_vis[month - 1, idx]),
+            'PressureHPa': 1013,
+            'DewPointC': temperature - 5,
+            'CloudCoverage': 2,
+            'WeatherCode': 'CLR',
+            'WeatherCondition': 'Clear'
+        }
+    
     def add_weather_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Add comprehensive weather features to flight data"""
         print("Fetching weather data from AVWX API...")
         
-        weather_data = []
         unique_airports = df['Airport'].unique()
+        icao_map = {a: self.IATA_TO_ICAO.get(a, a) for a in unique_airports}
         
-        for airport in unique_airports:
-            icao_code = self.IATA_TO_ICAO.get(airport, airport)
-            weather = self.fetch_avwx_weather(icao_code)
-            
-            # Add airport identifier for merging
-            weather['Airport'] = airport
-            weather_data.append(weather)
-            
-            print(f"✓ Weather data collected for {airport} ({icao_code})")
+        # One timestamp for the whole batch keeps cache keys and seasons consistent
+        fetch = functools.partial(self.fetch_avwx_weather, now=datetime.now())
         
-        # Create weather DataFrame
-        weather_df = pd.DataFrame(weather_data)
+        # METAR fetches are I/O-bound, so fan them out across threads
+        with ThreadPoolExecutor(max_workers=max(1, min(len(icao_map), 16))) as ex:
+            weather_by_airport = dict(zip(icao_map, ex.map(fetch, icao_map.values())))
         
-        # Merge with flight data
-        enhanced_df = pd.merge(df, weather_df, on='Airport', how='left')
+        for airport, icao_code in icao_map.items():
+            print(f"✓ Weather data collected for {airport} ({icao_code})")
+        
+        # Map each weather field onto the flights by airport (one hash probe per row, no join)
+        weather_keys = next(iter(weather_by_airport.values()), {}).keys()
+        enhanced_df = df.assign(**{
+            key: df['Airport'].map({a: w[key] for a, w in weather_by_airport.items()})
+            for key in weather_keys
+        })
         
         # Calculate derived weather features
         enhanced_df['WeatherImpactScore'] = self._calculate_weather_impact(enhanced_df)
         enhanced_df['IsBadWeather'] = (enhanced_df['WeatherImpactScore'] > 0.6).astype(int)
-        enhanced_df['WindCategory'] = pd.cut(enhanced_df['WindSpeedKt'], 
-                                            bins=[0, 10, 20, 35, 100], 
-                                            labels=[0, 1, 2, 3])
-        enhanced_df['VisibilityCategory'] = pd.cut(enhanced_df['VisibilityKm'],
-                                                  bins=[0, 3, 8, 15, 100],
-                                                  labels=[3, 2, 1, 0])  # Reversed: lower visibility = higher impact
+        # Impact categories as plain int8 codes; missing readings count as no impact (0)
+        enhanced_df['WindCategory'] = pd.cut(enhanced_df['WindSpeedKt'],
+                                            bins=[-np.inf, 10, 20, 35, np.inf],
+                                            labels=False).fillna(0).astype('int8')
+        enhanced_df['VisibilityCategory'] = (3 - pd.cut(enhanced_df['VisibilityKm'],
+                                                       bins=[-np.inf, 3, 8, 15, np.inf],
+                                                       labels=False)).fillna(0).astype('int8')  # Reversed: lower visibility = higher impact
         
         print(f"Enhanced {len(enhanced_df)} flights with comprehensive weather data")
         return enhanced_df
     
     def _calculate_weather_impact(self, df: pd.DataFrame) -> pd.Series:
         """Calculate comprehensive weather impact score (0-1 scale)"""
-        impact_score = pd.Series(0.0, index=df.index)
+        wind = df['WindSpeedKt'].to_numpy(dtype=np.float64)
+        visibility = df['VisibilityKm'].to_numpy(dtype=np.float64)
+        temperature = df['TemperatureC'].to_numpy(dtype=np.float64)
         
         # Wind impact (exponential above 15kt)
-        wind_impact = (df['WindSpeedKt'] / 50).clip(0, 1)
-        wind_impact = wind_impact ** 0.5  # Square root to emphasize higher winds
+        wind_impact = np.sqrt(np.clip(wind / 50.0, 0, 1))  # Square root to emphasize higher winds
         
         # Visibility impact (exponential below 8km)
-        vis_impact = (1 - df['VisibilityKm'] / 10).clip(0, 1)
-        vis_impact = vis_impact ** 2  # Square to emphasize low visibility
+        vis_impact = np.clip(1 - visibility / 10.0, 0, 1) ** 2  # Square to emphasize low visibility
         
-        # Weather condition impact
-        weather_impact = df['WeatherCondition'].apply(self._get_weather_condition_impact)
+        # Weather condition impact (vectorized keyword match)
+        conditions = df['WeatherCondition']
+        lowered = conditions.astype(str).str.lower()
+        high = lowered.str.contains('|'.join(self.HIGH_IMPACT_WEATHER), regex=True)
+        medium = lowered.str.contains('|'.join(self.MEDIUM_IMPACT_WEATHER), regex=True)
+        weather_impact = np.select([conditions.isna(), high, medium], [0.0, 0.8, 0.4], default=0.1)
         
         # Temperature extremes
-        temp_impact = ((df['TemperatureC'] - 15).abs() / 30).clip(0, 1)
+        temp_impact = np.clip(np.abs(temperature - 15) / 30.0, 0, 1)
         
         # Combined impact (weighted average)
         impact_score = (wind_impact * 0.3 + vis_impact * 0.4 + 
                        weather_impact * 0.2 + temp_impact * 0.1)
         
-        return impact_score.clip(0, 1)
+        return pd.Series(np.clip(impact_score, 0, 1), index=df.index)
     
     def _get_weather_condition_impact(self, condition: str) -> float:
-        """Get weather condition impact score"""
+        """Get weather condition impact score for a single condition string"""
         if pd.isna(condition):
             return 0.0
         
         condition = str(condition).lower()
         
-        high_impact = ['thunderstorm', 'heavy', 'freezing', 'snow', 'ice']
-        medium_impact = ['rain', 'drizzle', 'mist', 'fog', 'haze']
-        
-        if any(word in condition for word in high_impact):
+        if any(word in condition for word in self.HIGH_IMPACT_WEATHER):
             return 0.8
-        elif any(word in condition for word in medium_impact):
+        elif any(word in condition for word in self.MEDIUM_IMPACT_WEATHER):
             return 0.4
         else:
             return 0.1
     
-    def save_enhanced_dataset(self, df: pd.DataFrame, filename: str = None) -> str:
-        """Save enhanced dataset with weather and temporal features"""
+    def save_enhanced_dataset(self, df: pd.DataFrame, filename: str = None,
+                              file_format: str = 'csv') -> str:
+        """
+        Save enhanced dataset with weather and temporal features
+        file_format: 'csv' (default) or 'parquet', which keeps dtypes for the ML scripts
+        """
+        if file_format not in ('csv', 'parquet'):
+            raise ValueError(f"Unsupported file_format: {file_format}")
+        if file_format == 'parquet' and not PYARROW_AVAILABLE:
+            print("pyarrow not installed - saving enhanced dataset as CSV")
+            file_format = 'csv'
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         if filename is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"enhanced_flight_data_{timestamp}.csv"
+            filename = f"enhanced_flight_data_{timestamp}.{file_format}"
+        elif not os.path.splitext(filename)[1]:
+            filename = f"{filename}.{file_format}"
         
         # Ensure output directory exists
         os.makedirs('data/enhanced', exist_ok=True)
         filepath = f'data/enhanced/{filename}'
         
-        df.to_csv(filepath, index=False)
+        if file_format == 'parquet':
+            df.to_parquet(filepath, engine='pyarrow', compression='snappy', index=False)
+        else:
+            df.to_csv(filepath, index=False)
         
         # Save feature summary
         feature_summary = {
             'timestamp': datetime.now().isoformat(),
+            'format': file_format,
             'total_flights': len(df),
             'total_features': len(df.columns),
             'temporal_features': ['Month', 'Weekday', 'Hour', 'Season', 'TimeCategory', 'IsWeekend', 'IsPeakSummer', 'IsHolidayPeriod', 'DayOfYear'],
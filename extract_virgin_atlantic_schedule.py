@@ -2,86 +2,137 @@
 """
 Extract Virgin Atlantic flight schedule data from official PDF
 """
-import pdfplumber
 import json
 import re
 from datetime import datetime, timedelta
 from typing import List, Dict, Any
 
+# Single-pass schedule tokenizer; whitespace inside a token never spans a line break.
+# Overlaps the old per-line patterns allowed are kept:
+# a flight number that doubles as a time or contains an aircraft code is captured by
+# lookahead, and uppercase day codes (e.g. SAT) match as airports and are also
+# counted as frequencies in _process_text.
+_SCHEDULE_TOKEN_RE = re.compile(r"""
+    (?P<eol>\n)
+  | (?P<flight>(?i:VS)[^\S\n]*
+        (?:(?=\b(?P<flight_time>\d{1,2}:\d{2})\b))?
+        (?:(?=\d*?(?P<flight_aircraft>787|747)))?
+        (?P<flight_number>\d+)(?(flight_time):\d{2}))
+  | (?P<aircraft>787|A330|A340|A350|747)
+  | (?P<time>\b(?P<time_hour>\d{1,2}):(?P<time_minute>\d{2})\b)
+  | (?P<airport>\b[A-Z]{3}\b)
+  | (?P<frequency>(?i:daily|weekly|mon|tue|wed|thu|fri|sat|sun))
+""", re.VERBOSE)
+_FLIGHT_RE = re.compile(r'VS[^\S\n]*(\d+)', re.IGNORECASE)
+_DAY_CODES = frozenset({'MON', 'TUE', 'WED', 'THU', 'FRI', 'SAT', 'SUN'})
+
+# Schedule aircraft codes to fleet type names
+_AIRCRAFT_MAP = {
+    '787': 'Boeing 787-9',
+    'A330': 'Airbus A330-300',
+    'A350': 'Airbus A350-1000',
+    'A340': 'Airbus A340-600',
+    '747': 'Boeing 747-400'
+}
+
+def _apply_line(current_flight: Dict[str, Any], flights: List[Dict], flight_number: str,
+                airports: List[str], aircraft: str, times: List[tuple], frequency: str) -> Dict[str, Any]:
+    """Apply the tokens found on one schedule line, returning the flight record now being built"""
+    # Virgin Atlantic flight numbers (VS followed by digits) start a new record
+    if flight_number is not None:
+        if current_flight:
+            flights.append(current_flight)
+        
+        current_flight = {
+            'flight_number': f"VS{flight_number}",
+            'airline': 'Virgin Atlantic',
+            'aircraft_type': None,
+            'route': None,
+            'departure_airport': None,
+            'arrival_airport': None,
+            'departure_time': None,
+            'arrival_time': None,
+            'frequency': None,
+            'effective_dates': None
+        }
+    
+    # Airport codes (3-letter IATA codes)
+    if len(airports) >= 2 and current_flight:
+        current_flight['departure_airport'] = airports[0]
+        current_flight['arrival_airport'] = airports[1]
+        current_flight['route'] = f"{airports[0]}-{airports[1]}"
+    
+    # Aircraft types
+    if aircraft and current_flight:
+        current_flight['aircraft_type'] = _AIRCRAFT_MAP[aircraft]
+    
+    # Time patterns (HH:MM format)
+    if times and current_flight:
+        if not current_flight['departure_time']:
+            current_flight['departure_time'] = f"{times[0][0].zfill(2)}:{times[0][1]}"
+        elif not current_flight['arrival_time'] and len(times) > 1:
+            current_flight['arrival_time'] = f"{times[1][0].zfill(2)}:{times[1][1]}"
+    
+    # Frequency patterns (daily, weekly, etc.)
+    if frequency and current_flight:
+        current_flight['frequency'] = frequency.upper()
+    
+    return current_flight
+
+def _process_text(text: str, current_flight: Dict[str, Any], flights: List[Dict]) -> Dict[str, Any]:
+    """Tokenize page text in one regex pass, applying tokens at each line end"""
+    flight_number = aircraft = frequency = None
+    airports, times = [], []
+    
+    for match in _SCHEDULE_TOKEN_RE.finditer(text):
+        kind = match.lastgroup
+        
+        if kind == 'eol':
+            current_flight = _apply_line(current_flight, flights, flight_number,
+                                         airports, aircraft, times, frequency)
+            flight_number = aircraft = frequency = None
+            airports, times = [], []
+        elif kind == 'flight':
+            if flight_number is None:
+                flight_number = match.group('flight_number')
+            if aircraft is None:
+                aircraft = match.group('flight_aircraft')
+            if match.group('flight_time'):
+                times.append(tuple(match.group('flight_time').split(':')))
+        elif kind == 'aircraft':
+            if aircraft is None:
+                aircraft = match.group('aircraft')
+        elif kind == 'time':
+            times.append((match.group('time_hour'), match.group('time_minute')))
+        elif kind == 'airport':
+            code = match.group('airport')
+            airports.append(code)
+            if frequency is None and code in _DAY_CODES:
+                frequency = code
+            # A code ending in VS may run straight into a flight number (e.g. "XVS 12")
+            if flight_number is None and code.endswith('VS'):
+                flight_match = _FLIGHT_RE.match(text, match.start() + 1)
+                if flight_match:
+                    flight_number = flight_match.group(1)
+        elif frequency is None:
+            frequency = match.group('frequency')
+    
+    return _apply_line(current_flight, flights, flight_number, airports, aircraft, times, frequency)
+
 def extract_flight_schedule_data(pdf_path: str) -> Dict[str, Any]:
     """Extract flight schedule data from Virgin Atlantic PDF"""
     flights = []
     
     try:
+        # Imported here so schedule helpers can be used without loading the PDF stack
+        import pdfplumber
+        
         with pdfplumber.open(pdf_path) as pdf:
-            full_text = ""
-            for page in pdf.pages:
-                text = page.extract_text()
-                if text:
-                    full_text += text + "\n"
-            
-            # Parse flight numbers, routes, and schedules
-            lines = full_text.split('\n')
+            # Parse flight numbers, routes, and schedules page by page
             current_flight = {}
             
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                
-                # Look for Virgin Atlantic flight numbers (VS followed by digits)
-                flight_match = re.search(r'VS\s*(\d+)', line, re.IGNORECASE)
-                if flight_match:
-                    if current_flight:
-                        flights.append(current_flight)
-                    
-                    current_flight = {
-                        'flight_number': f"VS{flight_match.group(1)}",
-                        'airline': 'Virgin Atlantic',
-                        'aircraft_type': None,
-                        'route': None,
-                        'departure_airport': None,
-                        'arrival_airport': None,
-                        'departure_time': None,
-                        'arrival_time': None,
-                        'frequency': None,
-                        'effective_dates': None
-                    }
-                
-                # Look for airport codes (3-letter IATA codes)
-                airport_codes = re.findall(r'\b[A-Z]{3}\b', line)
-                if len(airport_codes) >= 2 and current_flight:
-                    current_flight['departure_airport'] = airport_codes[0]
-                    current_flight['arrival_airport'] = airport_codes[1]
-                    current_flight['route'] = f"{airport_codes[0]}-{airport_codes[1]}"
-                
-                # Look for aircraft types
-                aircraft_match = re.search(r'(787|A330|A340|A350|747)', line)
-                if aircraft_match and current_flight:
-                    aircraft_type = aircraft_match.group(1)
-                    if aircraft_type == '787':
-                        current_flight['aircraft_type'] = 'Boeing 787-9'
-                    elif aircraft_type == 'A330':
-                        current_flight['aircraft_type'] = 'Airbus A330-300'
-                    elif aircraft_type == 'A350':
-                        current_flight['aircraft_type'] = 'Airbus A350-1000'
-                    elif aircraft_type == 'A340':
-                        current_flight['aircraft_type'] = 'Airbus A340-600'
-                    elif aircraft_type == '747':
-                        current_flight['aircraft_type'] = 'Boeing 747-400'
-                
-                # Look for time patterns (HH:MM format)
-                time_matches = re.findall(r'\b(\d{1,2}):(\d{2})\b', line)
-                if time_matches and current_flight:
-                    if not current_flight['departure_time']:
-                        current_flight['departure_time'] = f"{time_matches[0][0].zfill(2)}:{time_matches[0][1]}"
-                    elif not current_flight['arrival_time'] and len(time_matches) > 1:
-                        current_flight['arrival_time'] = f"{time_matches[1][0].zfill(2)}:{time_matches[1][1]}"
-                
-                # Look for frequency patterns (daily, weekly, etc.)
-                frequency_match = re.search(r'(daily|weekly|mon|tue|wed|thu|fri|sat|sun)', line, re.IGNORECASE)
-                if frequency_match and current_flight:
-                    current_flight['frequency'] = frequency_match.group(1).upper()
+            for page in pdf.pages:
+                current_flight = _process_text(page.extract_text() or '', current_flight, flights)
             
             # Add the last flight if it exists
             if current_flight:
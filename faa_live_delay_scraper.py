@@ -1,30 +1,50 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import importlib.util
+from functools import lru_cache
+import numpy as np
 import pandas as pd
 
+# Prefer the C-backed lxml parser when it is installed (checked without importing it)
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+STATUS_COLUMNS = ["faa", "airport_name", "delay_category", "status", "reason", "avg_delay"]
+
+# Keep-alive session reused across polls, with retry/backoff for transient errors
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.3,
+                      status_forcelist=[429, 502, 503, 504], raise_on_status=False)
+))
+
+@lru_cache(maxsize=None)
+def _status_row_selector():
+    """Status table row selector, compiled once on first scrape"""
+    import soupsieve
+    return soupsieve.compile("table.table-status tr")
+
 def scrape_faa_nasstatus():
+    # bs4 is only needed when actually scraping, not for the parsing helpers
+    from bs4 import BeautifulSoup
+
     url = "https://nasstatus.faa.gov"
-    response = requests.get(url)
-    soup = BeautifulSoup(response.content, "html.parser")
+    response = _SESSION.get(url)
+    soup = BeautifulSoup(response.content, HTML_PARSER)
 
-    airports = []
-    rows = soup.select("table.table-status tr")[1:]  # skip header
+    rows = _status_row_selector().select(soup)[1:]  # skip header
 
+    # One tuple per airport row, then a single column-wise frame build
+    airports = []
     for row in rows:
-        cols = row.find_all("td")
+        cols = row.find_all("td", limit=6)
         if not cols or len(cols) < 6:
             continue
+        airports.append(tuple(col.text.strip() for col in cols))
 
-        airports.append({
-            "faa": cols[0].text.strip(),
-            "airport_name": cols[1].text.strip(),
-            "delay_category": cols[2].text.strip(),
-            "status": cols[3].text.strip(),
-            "reason": cols[4].text.strip(),
-            "avg_delay": cols[5].text.strip(),
-        })
-
-    return pd.DataFrame(airports)
+    return pd.DataFrame.from_records(airports, columns=STATUS_COLUMNS)
 
 def parse_delay_minutes(delay_str):
     """Parse delay string into minutes"""
@@ -48,6 +68,18 @@ def parse_delay_minutes(delay_str):
         # Assume it's just minutes
         return int(numbers[0])
 
+def parse_delay_minutes_series(delays: pd.Series) -> pd.Series:
+    """Vectorized parse_delay_minutes over a whole column of delay strings"""
+    text = delays.fillna('').astype(str)
+    
+    # First two numbers in each string; "hour" strings read them as hours and minutes
+    numbers = text.str.extract(r'(\d+)\D*(\d+)?', expand=True)
+    first = pd.to_numeric(numbers[0]).fillna(0).astype(int)
+    second = pd.to_numeric(numbers[1]).fillna(0).astype(int)
+    has_hour = text.str.lower().str.contains('hour', regex=False)
+    
+    return pd.Series(np.where(has_hour, first * 60 + second, first), index=delays.index)
+
 def determine_risk_level(delay_minutes, status):
     """Determine risk level based on delay and status"""
     if status.lower() in ['closed', 'major delay']:
@@ -72,6 +104,28 @@ def calculate_otp_from_delay(delay_minutes):
     else:
         return 45.0
 
+def determine_risk_level_series(delay_minutes: pd.Series, status: pd.Series) -> pd.Series:
+    """Vectorized determine_risk_level over aligned delay and status columns"""
+    status_l = status.str.lower()
+    closed = status_l.isin(['closed', 'major delay'])
+    delayed = (delay_minutes > 60) | status_l.isin(['delay', 'moderate delay'])
+    
+    risk = np.select(
+        [closed, delayed & (delay_minutes > 120), delayed, delay_minutes > 15],
+        ['Red', 'Red', 'Amber', 'Amber'],
+        default='Green'
+    )
+    return pd.Series(risk, index=delay_minutes.index, dtype=object)
+
+def calculate_otp_from_delay_series(delay_minutes: pd.Series) -> pd.Series:
+    """Vectorized calculate_otp_from_delay over a delay column"""
+    otp = np.select(
+        [delay_minutes == 0, delay_minutes <= 15, delay_minutes <= 60, delay_minutes <= 120],
+        [85.0, 82.0, 75.0, 60.0],
+        default=45.0
+    )
+    return pd.Series(otp, index=delay_minutes.index)
+
 if __name__ == "__main__":
     # Test the scraper
     try:
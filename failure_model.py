@@ -3,14 +3,20 @@ Aircraft Digital Twin Failure Modeling System for AINO Aviation Platform
 Advanced failure simulation for Boeing 787-9 and other Virgin Atlantic fleet aircraft
 """
 
+import functools
 import json
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from types import MappingProxyType
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 
+# Weights applied to (fuel increase, speed reduction / 100, range reduction / 100,
+# diversion) when scoring operational capability
+SCORE_WEIGHTS = np.array([0.2, 0.3, 0.2, 0.15])
 
-@dataclass
+
+@dataclass(frozen=True)
 class FailureImpact:
     """Represents the impact of a specific failure on aircraft performance"""
     fuel_burn_multiplier: float
@@ -21,7 +27,7 @@ class FailureImpact:
     crew_workload: str
     diversion_required: bool
     time_to_stabilize: int  # minutes
-    operational_procedures: List[str]
+    operational_procedures: Tuple[str, ...]
 
 
 @dataclass
@@ -39,6 +45,248 @@ class SystemState:
     brake_system_status: str
 
 
+# Aircraft specifications; unknown types fall back to the B787-9
+AIRCRAFT_SPECS = MappingProxyType({
+    "B787-9": {
+        "max_fuel": 126372,  # kg
+        "max_range": 7635,   # nautical miles
+        "cruise_speed": 490,  # knots
+        "max_altitude": 43000,  # feet
+        "engines": "Rolls-Royce Trent 1000",
+        "hydraulic_systems": 3,
+        "electrical_systems": 4
+    },
+    "A350-1000": {
+        "max_fuel": 156000,  # kg
+        "max_range": 8700,   # nautical miles
+        "cruise_speed": 488,  # knots
+        "max_altitude": 43100,  # feet
+        "engines": "Trent XWB-97",
+        "hydraulic_systems": 3,
+        "electrical_systems": 4
+    },
+    "A330-300": {
+        "max_fuel": 97530,   # kg
+        "max_range": 6350,   # nautical miles
+        "cruise_speed": 478,  # knots
+        "max_altitude": 42000,  # feet
+        "engines": "Trent 700",
+        "hydraulic_systems": 3,
+        "electrical_systems": 3
+    },
+    "A330-900": {
+        "max_fuel": 139090,  # kg
+        "max_range": 7200,   # nautical miles
+        "cruise_speed": 478,  # knots
+        "max_altitude": 42000,  # feet
+        "engines": "Trent 7000",
+        "hydraulic_systems": 3,
+        "electrical_systems": 3
+    }
+})
+
+# Aircraft-specific failure characteristics from digital twin profiles
+AIRCRAFT_PROFILES = MappingProxyType({
+    "B787-9": {
+        "engine_failure": {
+            "fuel_penalty_factor": 1.2,
+            "drift_down_altitude_ft": 29000,
+            "speed_knots": 310,
+            "systems_lost": ["ELEC GEN 2", "HYD PRI R", "ENG BLEED R"]
+        },
+        "decompression": {
+            "fuel_penalty_factor": 1.3,
+            "descent_altitude_ft": 10000,
+            "emergency_descent_rate_fpm": 4000,
+            "oxygen_duration_min": 12
+        },
+        "hydraulic_failure": {
+            "landing_distance_factor": 1.25,
+            "flap_restriction": "Flaps 20",
+            "alternate_gear_extension_required": True
+        }
+    },
+    "A350-1000": {
+        "engine_failure": {
+            "fuel_penalty_factor": 1.18,
+            "drift_down_altitude_ft": 28000,
+            "speed_knots": 300,
+            "systems_lost": ["GEN 2", "HYD 2", "BLEED 2"]
+        },
+        "decompression": {
+            "fuel_penalty_factor": 1.28,
+            "descent_altitude_ft": 10000,
+            "emergency_descent_rate_fpm": 3500,
+            "oxygen_duration_min": 15
+        },
+        "hydraulic_failure": {
+            "landing_distance_factor": 1.3,
+            "flap_restriction": "Flaps 3",
+            "alternate_gear_extension_required": True
+        }
+    },
+    "A330-300": {
+        "engine_failure": {
+            "fuel_penalty_factor": 1.22,
+            "drift_down_altitude_ft": 27000,
+            "speed_knots": 290,
+            "systems_lost": ["GEN 2", "HYD 2", "BLEED 2"]
+        },
+        "decompression": {
+            "fuel_penalty_factor": 1.25,
+            "descent_altitude_ft": 10000,
+            "emergency_descent_rate_fpm": 3500,
+            "oxygen_duration_min": 14
+        },
+        "hydraulic_failure": {
+            "landing_distance_factor": 1.2,
+            "flap_restriction": "Flaps 3",
+            "alternate_gear_extension_required": True
+        }
+    },
+    "A330-900": {
+        "engine_failure": {
+            "fuel_penalty_factor": 1.22,
+            "drift_down_altitude_ft": 27000,
+            "speed_knots": 290,
+            "systems_lost": ["GEN 2", "HYD 2", "BLEED 2"]
+        },
+        "decompression": {
+            "fuel_penalty_factor": 1.25,
+            "descent_altitude_ft": 10000,
+            "emergency_descent_rate_fpm": 3500,
+            "oxygen_duration_min": 14
+        },
+        "hydraulic_failure": {
+            "landing_distance_factor": 1.2,
+            "flap_restriction": "Flaps 3",
+            "alternate_gear_extension_required": True
+        }
+    }
+})
+
+
+@functools.lru_cache(maxsize=None)
+def _build_failure_models(aircraft_type: str) -> MappingProxyType:
+    """Build the failure models for an aircraft type, shared by all its twins"""
+    profile = AIRCRAFT_PROFILES[aircraft_type]
+    
+    return MappingProxyType({
+        "hydraulic_failure": FailureImpact(
+            fuel_burn_multiplier=1.15,
+            speed_reduction=25,
+            altitude_restriction=35000,
+            range_reduction=12.0,
+            passenger_impact="Minor discomfort during approach/landing",
+            crew_workload="ELEVATED - Manual reversion procedures",
+            diversion_required=True,
+            time_to_stabilize=20,
+            operational_procedures=(
+                f"Execute hydraulic failure checklist",
+                f"Configure flight controls to manual reversion",
+                f"Flap restriction: {profile['hydraulic_failure']['flap_restriction']}",
+                f"Landing distance factor: {profile['hydraulic_failure']['landing_distance_factor']}x",
+                f"Alternate gear extension: {'Required' if profile['hydraulic_failure']['alternate_gear_extension_required'] else 'Not required'}",
+                "Coordinate with maintenance for ground inspection"
+            )
+        ),
+        "engine_failure": FailureImpact(
+            fuel_burn_multiplier=profile["engine_failure"]["fuel_penalty_factor"],
+            speed_reduction=AIRCRAFT_SPECS[aircraft_type]["cruise_speed"] - profile["engine_failure"]["speed_knots"],
+            altitude_restriction=profile["engine_failure"]["drift_down_altitude_ft"],
+            range_reduction=25.0,
+            passenger_impact="Moderate - Extended flight time and turbulence",
+            crew_workload="HIGH - Single engine procedures",
+            diversion_required=True,
+            time_to_stabilize=15,
+            operational_procedures=(
+                "Execute engine failure checklist",
+                f"Drift down to {profile['engine_failure']['drift_down_altitude_ft']:,}ft",
+                f"Maintain single engine speed: {profile['engine_failure']['speed_knots']} knots",
+                f"Systems lost: {', '.join(profile['engine_failure']['systems_lost'])}",
+                "Consider weight reduction if necessary",
+                "Plan single engine approach procedures",
+                "Alert ATC for priority handling"
+            )
+        ),
+        "electrical_failure": FailureImpact(
+            fuel_burn_multiplier=1.28,
+            speed_reduction=20,
+            altitude_restriction=39000,
+            range_reduction=8.0,
+            passenger_impact="Minimal - Some cabin systems unavailable",
+            crew_workload="ELEVATED - Load shedding procedures",
+            diversion_required=True,
+            time_to_stabilize=10,
+            operational_procedures=(
+                "Execute electrical emergency checklist",
+                "Shed non-essential electrical loads",
+                "Monitor battery and generator status",
+                "Plan for manual backup systems",
+                "Consider APU start for backup power"
+            )
+        ),
+        "pressurization_failure": FailureImpact(
+            fuel_burn_multiplier=profile["decompression"]["fuel_penalty_factor"],
+            speed_reduction=35,
+            altitude_restriction=profile["decompression"]["descent_altitude_ft"],
+            range_reduction=35.0,
+            passenger_impact="HIGH - Emergency descent and oxygen masks",
+            crew_workload="CRITICAL - Emergency descent procedures",
+            diversion_required=True,
+            time_to_stabilize=8,
+            operational_procedures=(
+                f"Execute rapid descent to {profile['decompression']['descent_altitude_ft']:,}ft",
+                f"Emergency descent rate: {profile['decompression']['emergency_descent_rate_fpm']:,} fpm",
+                "Deploy passenger oxygen masks",
+                f"Cabin oxygen duration: {profile['decompression']['oxygen_duration_min']} minutes",
+                "Declare emergency with ATC",
+                "Plan immediate diversion to nearest suitable airport",
+                "Monitor cabin altitude and passenger condition"
+            )
+        ),
+        "landing_gear_malfunction": FailureImpact(
+            fuel_burn_multiplier=1.25,
+            speed_reduction=15,
+            altitude_restriction=None,
+            range_reduction=5.0,
+            passenger_impact="Moderate - Extended flight time for troubleshooting",
+            crew_workload="ELEVATED - Landing gear extension procedures",
+            diversion_required=True,
+            time_to_stabilize=25,
+            operational_procedures=(
+                "Execute landing gear malfunction checklist",
+                "Attempt manual gear extension",
+                "Burn fuel to achieve maximum landing weight",
+                "Coordinate with ground for emergency services",
+                "Plan for possible gear-up landing"
+            )
+        )
+    })
+
+
+@functools.lru_cache(maxsize=None)
+def _build_failure_columns(aircraft_type: str) -> tuple:
+    """Column-wise view of the failure models, indexed by name_to_idx"""
+    failure_models = _build_failure_models(aircraft_type)
+    models = list(failure_models.values())
+    name_to_idx = MappingProxyType({name: i for i, name in enumerate(failure_models)})
+    fuel_mult = np.array([m.fuel_burn_multiplier for m in models], dtype=np.float64)
+    speed_red = np.array([m.speed_reduction for m in models], dtype=np.float64)
+    range_red = np.array([m.range_reduction for m in models], dtype=np.float64)
+    div_req = np.array([m.diversion_required for m in models], dtype=bool)
+    score_penalty = np.column_stack([
+        fuel_mult - 1.0,
+        speed_red / 100,
+        range_red / 100,
+        div_req
+    ]) @ SCORE_WEIGHTS
+    columns = (fuel_mult, speed_red, range_red, div_req, score_penalty)
+    for column in columns:
+        column.setflags(write=False)
+    return (name_to_idx,) + columns
+
+
 class AircraftTwin:
     """Advanced Aircraft Digital Twin with failure modeling capabilities"""
     
@@ -46,7 +294,9 @@ class AircraftTwin:
         self.aircraft_type = aircraft_type
         self.registration = registration or f"G-V{aircraft_type.replace('-', '')}"
         self.active_failures: List[str] = []
+        self._active_idxs: List[int] = []
         self.failure_timestamp = None
+        self._failure_ts_iso = None
         
         # Initialize aircraft-specific parameters
         self._initialize_aircraft_specs()
@@ -55,46 +305,8 @@ class AircraftTwin:
         
     def _initialize_aircraft_specs(self):
         """Initialize aircraft-specific specifications"""
-        aircraft_specs = {
-            "B787-9": {
-                "max_fuel": 126372,  # kg
-                "max_range": 7635,   # nautical miles
-                "cruise_speed": 490,  # knots
-                "max_altitude": 43000,  # feet
-                "engines": "Rolls-Royce Trent 1000",
-                "hydraulic_systems": 3,
-                "electrical_systems": 4
-            },
-            "A350-1000": {
-                "max_fuel": 156000,  # kg
-                "max_range": 8700,   # nautical miles
-                "cruise_speed": 488,  # knots
-                "max_altitude": 43100,  # feet
-                "engines": "Trent XWB-97",
-                "hydraulic_systems": 3,
-                "electrical_systems": 4
-            },
-            "A330-300": {
-                "max_fuel": 97530,   # kg
-                "max_range": 6350,   # nautical miles
-                "cruise_speed": 478,  # knots
-                "max_altitude": 42000,  # feet
-                "engines": "Trent 700",
-                "hydraulic_systems": 3,
-                "electrical_systems": 3
-            },
-            "A330-900": {
-                "max_fuel": 139090,  # kg
-                "max_range": 7200,   # nautical miles
-                "cruise_speed": 478,  # knots
-                "max_altitude": 42000,  # feet
-                "engines": "Trent 7000",
-                "hydraulic_systems": 3,
-                "electrical_systems": 3
-            }
-        }
-        
-        self.specs = aircraft_specs.get(self.aircraft_type, aircraft_specs["B787-9"])
+        key = self.aircraft_type if self.aircraft_type in AIRCRAFT_SPECS else "B787-9"
+        self.specs = dict(AIRCRAFT_SPECS[key])
         
     def _initialize_system_states(self):
         """Initialize normal system states"""
@@ -131,183 +343,21 @@ class AircraftTwin:
                 brake_system_status="NORMAL"
             )
             
+        # Combined impact of active failures, updated as failures are applied
+        self._perf_cache = {
+            "fuel_burn_multiplier": 1.0,
+            "speed_reduction": 0,
+            "altitude_restriction": self.specs["max_altitude"],
+            "range_reduction": 0.0,
+            "diversion_required": False
+        }
+            
     def _initialize_failure_models(self):
         """Initialize comprehensive failure models for different aircraft systems"""
-        # Load aircraft-specific failure characteristics from digital twin profiles
-        aircraft_profiles = {
-            "B787-9": {
-                "engine_failure": {
-                    "fuel_penalty_factor": 1.2,
-                    "drift_down_altitude_ft": 29000,
-                    "speed_knots": 310,
-                    "systems_lost": ["ELEC GEN 2", "HYD PRI R", "ENG BLEED R"]
-                },
-                "decompression": {
-                    "fuel_penalty_factor": 1.3,
-                    "descent_altitude_ft": 10000,
-                    "emergency_descent_rate_fpm": 4000,
-                    "oxygen_duration_min": 12
-                },
-                "hydraulic_failure": {
-                    "landing_distance_factor": 1.25,
-                    "flap_restriction": "Flaps 20",
-                    "alternate_gear_extension_required": True
-                }
-            },
-            "A350-1000": {
-                "engine_failure": {
-                    "fuel_penalty_factor": 1.18,
-                    "drift_down_altitude_ft": 28000,
-                    "speed_knots": 300,
-                    "systems_lost": ["GEN 2", "HYD 2", "BLEED 2"]
-                },
-                "decompression": {
-                    "fuel_penalty_factor": 1.28,
-                    "descent_altitude_ft": 10000,
-                    "emergency_descent_rate_fpm": 3500,
-                    "oxygen_duration_min": 15
-                },
-                "hydraulic_failure": {
-                    "landing_distance_factor": 1.3,
-                    "flap_restriction": "Flaps 3",
-                    "alternate_gear_extension_required": True
-                }
-            },
-            "A330-300": {
-                "engine_failure": {
-                    "fuel_penalty_factor": 1.22,
-                    "drift_down_altitude_ft": 27000,
-                    "speed_knots": 290,
-                    "systems_lost": ["GEN 2", "HYD 2", "BLEED 2"]
-                },
-                "decompression": {
-                    "fuel_penalty_factor": 1.25,
-                    "descent_altitude_ft": 10000,
-                    "emergency_descent_rate_fpm": 3500,
-                    "oxygen_duration_min": 14
-                },
-                "hydraulic_failure": {
-                    "landing_distance_factor": 1.2,
-                    "flap_restriction": "Flaps 3",
-                    "alternate_gear_extension_required": True
-                }
-            },
-            "A330-900": {
-                "engine_failure": {
-                    "fuel_penalty_factor": 1.22,
-                    "drift_down_altitude_ft": 27000,
-                    "speed_knots": 290,
-                    "systems_lost": ["GEN 2", "HYD 2", "BLEED 2"]
-                },
-                "decompression": {
-                    "fuel_penalty_factor": 1.25,
-                    "descent_altitude_ft": 10000,
-                    "emergency_descent_rate_fpm": 3500,
-                    "oxygen_duration_min": 14
-                },
-                "hydraulic_failure": {
-                    "landing_distance_factor": 1.2,
-                    "flap_restriction": "Flaps 3",
-                    "alternate_gear_extension_required": True
-                }
-            }
-        }
-        
-        # Get aircraft-specific profile, default to B787-9 if not found
-        profile = aircraft_profiles.get(self.aircraft_type, aircraft_profiles["B787-9"])
-        
-        self.failure_models = {
-            "hydraulic_failure": FailureImpact(
-                fuel_burn_multiplier=1.15,
-                speed_reduction=25,
-                altitude_restriction=35000,
-                range_reduction=12.0,
-                passenger_impact="Minor discomfort during approach/landing",
-                crew_workload="ELEVATED - Manual reversion procedures",
-                diversion_required=True,
-                time_to_stabilize=20,
-                operational_procedures=[
-                    f"Execute hydraulic failure checklist",
-                    f"Configure flight controls to manual reversion",
-                    f"Flap restriction: {profile['hydraulic_failure']['flap_restriction']}",
-                    f"Landing distance factor: {profile['hydraulic_failure']['landing_distance_factor']}x",
-                    f"Alternate gear extension: {'Required' if profile['hydraulic_failure']['alternate_gear_extension_required'] else 'Not required'}",
-                    "Coordinate with maintenance for ground inspection"
-                ]
-            ),
-            "engine_failure": FailureImpact(
-                fuel_burn_multiplier=profile["engine_failure"]["fuel_penalty_factor"],
-                speed_reduction=self.specs["cruise_speed"] - profile["engine_failure"]["speed_knots"],
-                altitude_restriction=profile["engine_failure"]["drift_down_altitude_ft"],
-                range_reduction=25.0,
-                passenger_impact="Moderate - Extended flight time and turbulence",
-                crew_workload="HIGH - Single engine procedures",
-                diversion_required=True,
-                time_to_stabilize=15,
-                operational_procedures=[
-                    "Execute engine failure checklist",
-                    f"Drift down to {profile['engine_failure']['drift_down_altitude_ft']:,}ft",
-                    f"Maintain single engine speed: {profile['engine_failure']['speed_knots']} knots",
-                    f"Systems lost: {', '.join(profile['engine_failure']['systems_lost'])}",
-                    "Consider weight reduction if necessary",
-                    "Plan single engine approach procedures",
-                    "Alert ATC for priority handling"
-                ]
-            ),
-            "electrical_failure": FailureImpact(
-                fuel_burn_multiplier=1.28,
-                speed_reduction=20,
-                altitude_restriction=39000,
-                range_reduction=8.0,
-                passenger_impact="Minimal - Some cabin systems unavailable",
-                crew_workload="ELEVATED - Load shedding procedures",
-                diversion_required=True,
-                time_to_stabilize=10,
-                operational_procedures=[
-                    "Execute electrical emergency checklist",
-                    "Shed non-essential electrical loads",
-                    "Monitor battery and generator status",
-                    "Plan for manual backup systems",
-                    "Consider APU start for backup power"
-                ]
-            ),
-            "pressurization_failure": FailureImpact(
-                fuel_burn_multiplier=profile["decompression"]["fuel_penalty_factor"],
-                speed_reduction=35,
-                altitude_restriction=profile["decompression"]["descent_altitude_ft"],
-                range_reduction=35.0,
-                passenger_impact="HIGH - Emergency descent and oxygen masks",
-                crew_workload="CRITICAL - Emergency descent procedures",
-                diversion_required=True,
-                time_to_stabilize=8,
-                operational_procedures=[
-                    f"Execute rapid descent to {profile['decompression']['descent_altitude_ft']:,}ft",
-                    f"Emergency descent rate: {profile['decompression']['emergency_descent_rate_fpm']:,} fpm",
-                    "Deploy passenger oxygen masks",
-                    f"Cabin oxygen duration: {profile['decompression']['oxygen_duration_min']} minutes",
-                    "Declare emergency with ATC",
-                    "Plan immediate diversion to nearest suitable airport",
-                    "Monitor cabin altitude and passenger condition"
-                ]
-            ),
-            "landing_gear_malfunction": FailureImpact(
-                fuel_burn_multiplier=1.25,
-                speed_reduction=15,
-                altitude_restriction=None,
-                range_reduction=5.0,
-                passenger_impact="Moderate - Extended flight time for troubleshooting",
-                crew_workload="ELEVATED - Landing gear extension procedures",
-                diversion_required=True,
-                time_to_stabilize=25,
-                operational_procedures=[
-                    "Execute landing gear malfunction checklist",
-                    "Attempt manual gear extension",
-                    "Burn fuel to achieve maximum landing weight",
-                    "Coordinate with ground for emergency services",
-                    "Plan for possible gear-up landing"
-                ]
-            )
-        }
+        key = self.aircraft_type if self.aircraft_type in AIRCRAFT_SPECS else "B787-9"
+        self.failure_models = _build_failure_models(key)
+        (self._name_to_idx, self._fuel_mult, self._speed_red,
+         self._range_red, self._div_req, self._score_penalty) = _build_failure_columns(key)
         
     def apply_failure(self, failure_type: str, severity: str = "standard"):
         """Apply a specific failure to the aircraft twin"""
@@ -315,7 +365,19 @@ class AircraftTwin:
             raise ValueError(f"Unknown failure type: {failure_type}")
             
         self.active_failures.append(failure_type)
+        self._active_idxs.append(self._name_to_idx[failure_type])
         self.failure_timestamp = datetime.now()
+        self._failure_ts_iso = self.failure_timestamp.isoformat()
+        
+        # Fold the failure into the combined performance impact
+        impact = self.failure_models[failure_type]
+        perf = self._perf_cache
+        perf["fuel_burn_multiplier"] *= impact.fuel_burn_multiplier
+        perf["speed_reduction"] += impact.speed_reduction
+        if impact.altitude_restriction:
+            perf["altitude_restriction"] = min(perf["altitude_restriction"], impact.altitude_restriction)
+        perf["range_reduction"] += impact.range_reduction
+        perf["diversion_required"] = perf["diversion_required"] or impact.diversion_required
         
         # Modify system states based on failure type
         if failure_type == "hydraulic_failure":
@@ -338,48 +400,23 @@ class AircraftTwin:
         
     def get_performance_impact(self) -> Dict[str, Any]:
         """Calculate combined performance impact of all active failures"""
-        if not self.active_failures:
-            return {
-                "fuel_burn_multiplier": 1.0,
-                "speed_reduction": 0,
-                "altitude_restriction": self.specs["max_altitude"],
-                "range_reduction": 0.0,
-                "diversion_required": False
-            }
-            
-        # Calculate combined impacts
-        combined_fuel_multiplier = 1.0
-        combined_speed_reduction = 0
-        min_altitude = self.specs["max_altitude"]
-        combined_range_reduction = 0.0
-        diversion_required = False
-        
-        for failure in self.active_failures:
-            impact = self.failure_models[failure]
-            combined_fuel_multiplier *= impact.fuel_burn_multiplier
-            combined_speed_reduction += impact.speed_reduction
-            if impact.altitude_restriction:
-                min_altitude = min(min_altitude, impact.altitude_restriction)
-            combined_range_reduction += impact.range_reduction
-            diversion_required = diversion_required or impact.diversion_required
-            
-        return {
-            "fuel_burn_multiplier": combined_fuel_multiplier,
-            "speed_reduction": combined_speed_reduction,
-            "altitude_restriction": min_altitude,
-            "range_reduction": min(combined_range_reduction, 50.0),  # Cap at 50%
-            "diversion_required": diversion_required
-        }
+        performance_impact = dict(self._perf_cache)
+        performance_impact["range_reduction"] = min(performance_impact["range_reduction"], 50.0)  # Cap at 50%
+        return performance_impact
         
     def export_for_ml(self) -> Dict[str, Any]:
         """Export aircraft twin data in format suitable for ML training"""
         performance_impact = self.get_performance_impact()
+        now = datetime.now()
+        seconds_since_failure = (
+            (now - self.failure_timestamp).total_seconds() if self.failure_timestamp else 0
+        )
         
         ml_data = {
             "aircraft_id": self.registration,
             "aircraft_type": self.aircraft_type,
-            "timestamp": datetime.now().isoformat(),
-            "failure_timestamp": self.failure_timestamp.isoformat() if self.failure_timestamp else None,
+            "timestamp": now.isoformat(),
+            "failure_timestamp": self._failure_ts_iso,
             "active_failures": self.active_failures,
             "num_failures": len(self.active_failures),
             
@@ -412,37 +449,72 @@ class AircraftTwin:
             "operational_capability_score": self._calculate_operational_score(),
             
             # Time-based features
-            "time_since_failure_minutes": (
-                (datetime.now() - self.failure_timestamp).total_seconds() / 60
-                if self.failure_timestamp else 0
-            ),
+            "time_since_failure_minutes": seconds_since_failure / 60 if self.failure_timestamp else 0,
             "stabilization_complete": (
-                1 if self.failure_timestamp and 
-                (datetime.now() - self.failure_timestamp).total_seconds() > 1200  # 20 minutes
+                1 if self.failure_timestamp and seconds_since_failure > 1200  # 20 minutes
                 else 0
             )
         }
         
         return ml_data
         
+    @classmethod
+    def export_batch_for_ml(cls, twins: List["AircraftTwin"]) -> Dict[str, np.ndarray]:
+        """Export a batch of aircraft twins as columnar arrays for ML training"""
+        n = len(twins)
+        fuel_mult = np.empty(n, dtype=np.float64)
+        speed_red = np.empty(n, dtype=np.float64)
+        alt_restr = np.empty(n, dtype=np.int64)
+        range_red = np.empty(n, dtype=np.float64)
+        diversion = np.empty(n, dtype=np.int8)
+        max_range = np.empty(n, dtype=np.float64)
+        cruise_speed = np.empty(n, dtype=np.float64)
+        num_failures = np.empty(n, dtype=np.int64)
+        
+        for i, twin in enumerate(twins):
+            perf = twin._perf_cache
+            fuel_mult[i] = perf["fuel_burn_multiplier"]
+            speed_red[i] = perf["speed_reduction"]
+            alt_restr[i] = perf["altitude_restriction"]
+            range_red[i] = perf["range_reduction"]
+            diversion[i] = perf["diversion_required"]
+            max_range[i] = twin.specs["max_range"]
+            cruise_speed[i] = twin.specs["cruise_speed"]
+            num_failures[i] = len(twin._active_idxs)
+            
+        np.minimum(range_red, 50.0, out=range_red)  # Cap at 50%
+        
+        # Per-failure score penalties, summed per twin
+        penalty = np.concatenate(
+            [twin._score_penalty[twin._active_idxs] for twin in twins] or [np.empty(0)]
+        )
+        score = 1.0 - np.bincount(np.repeat(np.arange(n), num_failures), weights=penalty, minlength=n)
+        score = np.where(num_failures > 0, np.maximum(score, 0.1), 1.0)
+        
+        return {
+            "aircraft_id": np.array([twin.registration for twin in twins], dtype=object),
+            "aircraft_type": np.array([twin.aircraft_type for twin in twins], dtype=object),
+            "num_failures": num_failures,
+            "max_range_nm": max_range,
+            "cruise_speed_knots": cruise_speed,
+            "fuel_burn_multiplier": fuel_mult,
+            "speed_reduction_knots": speed_red,
+            "altitude_restriction_ft": alt_restr,
+            "range_reduction_percent": range_red,
+            "diversion_required": diversion,
+            "effective_cruise_speed": np.subtract(cruise_speed, speed_red),
+            "effective_range": np.multiply(max_range, 1 - range_red / 100),
+            "fuel_efficiency_ratio": np.divide(1.0, fuel_mult),
+            "operational_capability_score": score
+        }
+        
     def _calculate_operational_score(self) -> float:
         """Calculate overall operational capability score (0-1)"""
         if not self.active_failures:
             return 1.0
             
         # Base score starts at 1.0 and is reduced by failures
-        score = 1.0
-        
-        for failure in self.active_failures:
-            impact = self.failure_models[failure]
-            
-            # Reduce score based on various impact factors
-            score -= (impact.fuel_burn_multiplier - 1.0) * 0.2
-            score -= (impact.speed_reduction / 100) * 0.3
-            score -= (impact.range_reduction / 100) * 0.2
-            
-            if impact.diversion_required:
-                score -= 0.15
+        score = 1.0 - float(self._score_penalty[self._active_idxs].sum())
                 
         return max(score, 0.1)  # Minimum score of 0.1
         
@@ -456,7 +528,9 @@ class AircraftTwin:
     def reset_failures(self):
         """Reset aircraft to normal operational state"""
         self.active_failures = []
+        self._active_idxs = []
         self.failure_timestamp = None
+        self._failure_ts_iso = None
         self._initialize_system_states()
         print(f"✅ {self.aircraft_type} {self.registration} reset to normal operational state")
         
@@ -470,7 +544,7 @@ class AircraftTwin:
             },
             "system_status": asdict(self.system_state),
             "active_failures": self.active_failures,
-            "failure_timestamp": self.failure_timestamp.isoformat() if self.failure_timestamp else None,
+            "failure_timestamp": self._failure_ts_iso,
             "performance_impact": self.get_performance_impact(),
             "operational_procedures": self.get_operational_procedures(),
             "operational_score": self._calculate_operational_score(),
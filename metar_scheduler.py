@@ -1,8 +1,11 @@
 # metar_scheduler.py
 from datetime import datetime
+import logging
 import os
 from download_metar_ogimet import download_noaa_metar
 
+logger = logging.getLogger(__name__)
+
 STATE_FILE = "data/metar/last_run.txt"
 
 def should_run_this_month():
@@ -21,17 +24,21 @@ def update_last_run():
 
 def run_metar_update():
     if not should_run_this_month():
-        print("METAR update already performed this month.")
+        logger.info("METAR update already performed this month.")
         return
 
-    print("Running monthly METAR update...")
+    logger.info("Running monthly METAR update...")
     airports = ["JFK", "BOS", "ATL", "LAX", "SFO", "MCO", "MIA", "TPA", "LAS"]
     now = datetime.utcnow()
     for icao in airports:
         download_noaa_metar(icao, now.year, now.month)
     
     update_last_run()
-    print("METAR update complete.")
+    logger.info("METAR update complete.")
 
 # Call this from app startup or model training script:
-# run_metar_update()
\ No newline at end of file
+# run_metar_update()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    run_metar_update()
@@ -8,6 +8,7 @@ import numpy as np
 from datetime import datetime, timedelta
 import json
 import os
+import logging
 from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
 from sklearn.preprocessing import LabelEncoder
 import warnings
@@ -345,4 +346,5 @@ def main():
     return results
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     validation_results = main()
\ No newline at end of file
@@ -35,7 +35,7 @@ scenario = ranker.evaluate_diversion_scenario(
     flight_phase="${flight_phase || 'cruise'}"
 )
 
-print("AINO_RESULT:", json.dumps(scenario, indent=2))
+print("AINO_RESULT:", json.dumps(scenario.to_dict(), indent=2))
     `;
     
     const pythonProcess = spawn('python3', ['-c', pythonScript]);
@@ -8736,7 +8736,7 @@ else:
       // Execute Python live scraper
       const { exec } = require('child_process');
       
-      exec('python3 -c "from faa_live_delay_scraper import scrape_faa_nasstatus, parse_delay_minutes, determine_risk_level, calculate_otp_from_delay; import json; df = scrape_faa_nasstatus(); data = df.to_dict(orient=\'records\'); enhanced_data = [{**record, \'delay_minutes\': parse_delay_minutes(record[\'avg_delay\']), \'risk_level\': determine_risk_level(parse_delay_minutes(record[\'avg_delay\']), record[\'status\']), \'estimated_otp\': calculate_otp_from_delay(parse_delay_minutes(record[\'avg_delay\']))} for record in data]; print(json.dumps(enhanced_data, default=str))"', (error: any, stdout: any, stderr: any) => {
+      exec('python3 -c "from faa_live_delay_scraper import scrape_faa_nasstatus, parse_delay_minutes_series, determine_risk_level_series, calculate_otp_from_delay_series; import json; df = scrape_faa_nasstatus(); delays = parse_delay_minutes_series(df[\'avg_delay\']) if len(df) else None; df = df.assign(delay_minutes=delays, risk_level=determine_risk_level_series(delays, df[\'status\']), estimated_otp=calculate_otp_from_delay_series(delays)) if len(df) else df; enhanced_data = df.to_dict(orient=\'records\'); print(json.dumps(enhanced_data, default=str))"', (error: any, stdout: any, stderr: any) => {
         if (error) {
           console.error('[FAA Live] Scraper error:', error);
           return res.status(500).json({
@@ -116,7 +116,7 @@ def test_a330_engine_failure():
         print(json.dumps(generated_failure_state, indent=2))
         
         # Export full scenario
-        filename = sim.export_scenario()
+        filename = sim.export_scenario().result()
         print(f"\n💾 Full scenario exported to: {filename}")
         
         return True
@@ -126,7 +126,7 @@ def test_complete_integration():
             print(f"   ❌ Error: {e}")
     
     # Export comprehensive scenario
-    filename = sim.export_scenario()
+    filename = sim.export_scenario().result()
     print(f"\n💾 Complete scenario exported to: {filename}")
     
     print(f"\n✅ Complete Post-Failure Actions Integration Successful!")
@@ -83,7 +83,7 @@ def test_scenario_simulator():
             print(f"   📄 Crew Actions: {len(result['crew_actions'])} steps")
             
             # Export scenario
-            filename = sim.export_scenario()
+            filename = sim.export_scenario().result()
             if filename:
                 print(f"   💾 Exported: {filename}")
             
@@ -1,3 +1,4 @@
+import logging
 import pandas as pd
 from metar_scheduler import run_metar_update
 from metar_enrichment import parse_metar_file, enrich_with_metar
@@ -6,6 +7,8 @@ from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import LabelEncoder
 from sklearn.metrics import classification_report
 
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
 # Step 1: Run monthly METAR update if needed
 run_metar_update()
 